@@ -18,6 +18,13 @@ class KVProtocol(Protocol, abstract=True):
         return await self.get(key) is not None
     async def keys(self, pattern: str = '*') -> list:
         raise NotImplementedError
+    async def get_many(self, keys: list) -> dict:
+        """Batch get: {key: value} for the keys that exist. Override in subclass for bulk optimization."""
+        values = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None: values[key] = value
+        return values
     async def remove_batch(self, keys: list):
         """Batch remove. Override in subclass for bulk optimization."""
         for key in keys: await self.remove(key)
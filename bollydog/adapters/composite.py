@@ -60,15 +60,13 @@ class CacheLayer(KVProtocol):
         return list(backend_keys | {k for k in self._cache if k.startswith(prefix)})
 
     async def load(self):
-        for key in await self.protocol.keys():
-            self._cache[key] = await self.protocol.get(key)
+        self._cache.update(await self.protocol.get_many(await self.protocol.keys()))
         self.logger.info(f'CacheLayer loaded {len(self._cache)} keys from {self.protocol.__class__.__name__}')
 
     async def flush(self):
         if not self._dirty: return
         count = len(self._dirty)
-        for key in list(self._dirty):
-            if key in self._cache: await self.protocol.set(key, self._cache[key])
+        await self.protocol.set_batch({k: self._cache[k] for k in self._dirty if k in self._cache})
         self._dirty.clear()
         self.logger.info(f'CacheLayer flushed {count} keys')
 
@@ -129,8 +127,7 @@ class TableCacheLayer(KVProtocol):
         return list(backend_keys | {k for k in self._cache if k.startswith(prefix)})
 
     async def load(self):
-        for key in await self.protocol.keys():
-            self._cache[key] = await self.protocol.get(key)
+        self._cache.update(await self.protocol.get_many(await self.protocol.keys()))
         self.logger.info(f'TableCacheLayer loaded {len(self._cache)} keys from {self.protocol.__class__.__name__}')
 
     async def flush(self):
@@ -1,53 +1,117 @@
+import asyncio
+import heapq
+import itertools
 import json
+import sys
 import time
+from contextlib import contextmanager
 from typing import Optional
+
+import mode
+
 from bollydog.models.protocol import Protocol
 from bollydog.adapters._base import KVProtocol
 
 
+def _approx_size(value, depth: int = 3) -> int:
+    """sys.getsizeof of value plus its items, containers followed `depth` levels deep."""
+    size = sys.getsizeof(value)
+    if depth and isinstance(value, dict):
+        size += sum(_approx_size(k, depth - 1) + _approx_size(v, depth - 1) for k, v in value.items())
+    elif depth and isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_approx_size(v, depth - 1) for v in value)
+    return size
+
+
 class MemoryProtocol(KVProtocol):
-    """In-memory dict KV with optional lazy TTL."""
+    """In-memory dict KV with TTL.
+
+    Expired keys vanish on access and are actively removed by the expirer task: deadlines
+    sit in a heap, so each pass (every expire_interval seconds at most, sooner when the
+    next deadline is due) costs O(expired log n) instead of a scan. A heap entry whose key
+    was rewritten or removed is skipped when popped; the heap is rebuilt once stale entries
+    outnumber live ones. memory is the approximate size of keys + values in bytes.
+    """
 
-    def __init__(self, **kwargs):
+    def __init__(self, expire_interval: float = 1.0, **kwargs):
         self._expiry: dict[str, float] = {}
+        self._deadlines: list = []  # heap of (deadline, key), may hold stale entries
+        self._sizes: dict[str, int] = {}
+        self.expire_interval, self.memory, self.expired = expire_interval, 0, 0
         super().__init__(**kwargs)
 
     async def on_start(self) -> None:
         self.adapter = {}
 
+    def _drop(self, key: str):
+        self.adapter.pop(key, None)
+        self._expiry.pop(key, None)
+        self.memory -= self._sizes.pop(key, 0)
+
     def _check_expired(self, key: str) -> bool:
         exp = self._expiry.get(key)
         if exp is not None and time.time() > exp:
-            self.adapter.pop(key, None)
-            self._expiry.pop(key, None)
+            self._drop(key)
+            self.expired += 1
             return True
         return False
 
+    def expire(self) -> int:
+        """Remove every key whose deadline has passed; O(expired log n)."""
+        now, removed, heap = time.time(), 0, self._deadlines
+        while heap and heap[0][0] < now:
+            deadline, key = heapq.heappop(heap)
+            if self._expiry.get(key) != deadline: continue  # rewritten, removed or already expired
+            self._drop(key)
+            removed += 1
+        self.expired += removed
+        return removed
+
+    @mode.Service.task
+    async def _expirer(self):
+        while not self.should_stop:
+            delay = self.expire_interval
+            if self._deadlines: delay = min(delay, max(0.0, self._deadlines[0][0] - time.time()))
+            await self.sleep(delay)
+            self.expire()
+
     async def get(self, key: str):
         if self._check_expired(key): return None
         return self.adapter.get(key)
 
+    async def get_many(self, keys: list) -> dict:
+        return {k: self.adapter[k] for k in keys if k in self.adapter and not self._check_expired(k)}
+
     async def set(self, key: str, value, ttl: int = None):
         self.adapter[key] = value
-        if ttl is not None: self._expiry[key] = time.time() + ttl
+        size = _approx_size(key) + _approx_size(value)
+        self.memory += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        if ttl is not None:
+            deadline = self._expiry[key] = time.time() + ttl
+            heapq.heappush(self._deadlines, (deadline, key))
+            if len(self._deadlines) > 2 * len(self._expiry) + 64:
+                self._deadlines = [(d, k) for k, d in self._expiry.items()]
+                heapq.heapify(self._deadlines)
         elif key in self._expiry: del self._expiry[key]
 
     async def remove(self, key: str):
-        self.adapter.pop(key, None)
-        self._expiry.pop(key, None)
+        self._drop(key)
 
     async def exists(self, key: str) -> bool:
         if self._check_expired(key): return False
         return key in self.adapter
 
     async def keys(self, pattern: str = '*') -> list:
-        now = time.time()
-        for k in [k for k, exp in self._expiry.items() if now > exp]:
-            self.adapter.pop(k, None); self._expiry.pop(k, None)
+        self.expire()
         if pattern == '*': return list(self.adapter.keys())
         prefix = pattern.rstrip('*')
         return [k for k in self.adapter if k.startswith(prefix)]
 
+    @property
+    def stats(self) -> dict:
+        return {'keys': len(self.adapter or ()), 'ttl_keys': len(self._expiry), 'memory': self.memory, 'expired': self.expired}
+
 
 # ─── RedisProtocol ────────────────────────────────────────────
 
@@ -65,6 +129,10 @@ class RedisProtocol(KVProtocol):
         data = await self.adapter.get(key)
         return json.loads(data) if data else None
 
+    async def get_many(self, keys: list) -> dict:
+        if not keys: return {}
+        return {k: json.loads(v) for k, v in zip(keys, await self.adapter.mget(keys)) if v}
+
     async def set(self, key: str, value, ttl: int = None):
         await self.adapter.set(key, json.dumps(value, ensure_ascii=False), ex=ttl)
 
@@ -89,54 +157,198 @@ class RedisProtocol(KVProtocol):
 # ─── SQLiteProtocol ───────────────────────────────────────────
 
 class SQLiteProtocol(KVProtocol):
-    """SQLite as KV store: kv(key TEXT PK, value TEXT, updated_at REAL)."""
-
-    def __init__(self, path: str = ':memory:', table: str = 'kv', **kwargs):
+    """SQLite as KV store: kv(key TEXT PK, value TEXT, updated_at REAL, expires_at REAL).
+
+    set(key, value, ttl) stores expires_at = now + ttl (NULL = never). Reads skip expired
+    rows; the sweeper task deletes them every sweep_interval seconds (0 = never), at most
+    sweep_batch rows per statement via the partial expires_at index, so no long DELETE
+    holds the writer. Tables from before expires_at are migrated on start.
+
+    journal_mode / synchronous are applied as PRAGMAs on start; the default None keeps the SQLite
+    default (rollback journal), journal_mode='wal' is opt-in since it adds -wal / -shm files.
+    group_commit: writes share transactions and each awaiting caller is released only after
+    the commit covering its write. A commit starts commit_window seconds after the first
+    write of a group (0 = next loop iteration) or once commit_max_ops are pending; writes
+    arriving while it runs form the next group, committed right after. Without it every
+    write commits on its own.
+
+    readers > 0 (file databases) opens that many read-only connections, each on its own
+    aiosqlite thread, for get / get_many / exists / keys; adapter stays the single writer,
+    so writes keep their order (use journal_mode='wal', or readers wait on every write). While any write is uncommitted, reads go to the writer so
+    they see it, as with a single connection.
+    """
+    JOURNAL_MODES = ('delete', 'truncate', 'persist', 'memory', 'wal', 'off')
+    SYNCHRONOUS = ('off', 'normal', 'full', 'extra')
+    IN_CHUNK = 500  # keys per IN (...) statement, below SQLITE_MAX_VARIABLE_NUMBER of older builds
+    LIVE = '(expires_at IS NULL OR expires_at > ?)'
+
+    def __init__(self, path: str = ':memory:', table: str = 'kv', journal_mode: Optional[str] = None,
+                 synchronous: Optional[str] = None, group_commit: bool = False, commit_window: float = 0.0,
+                 commit_max_ops: int = 256, readers: int = 0, sweep_interval: float = 60.0, sweep_batch: int = 500,
+                 **kwargs):
+        if journal_mode and journal_mode.lower() not in self.JOURNAL_MODES: raise ValueError(f'unknown journal_mode: {journal_mode}')
+        if synchronous and synchronous.lower() not in self.SYNCHRONOUS: raise ValueError(f'unknown synchronous: {synchronous}')
         self.path, self.table = path, table
+        self.journal_mode, self.synchronous = journal_mode, synchronous
+        self.group_commit, self.commit_window, self.commit_max_ops = group_commit, commit_window, commit_max_ops
+        self._group: Optional[asyncio.Future] = None  # commit shared by the writes of the open group
+        self._group_ops, self._group_timer, self._flush_task = 0, None, None
+        self.commits = 0
+        self.readers, self._readers, self._next_reader, self._writes = readers, [], itertools.count(), 0
+        self.sweep_interval, self.sweep_batch, self.expired = sweep_interval, sweep_batch, 0
         super().__init__(**kwargs)
 
     async def on_start(self) -> None:
         import os, aiosqlite
         if self.path != ':memory:': os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
         self.adapter = await aiosqlite.connect(self.path)
-        await self.adapter.execute(f'CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT, updated_at REAL)')
+        if self.journal_mode: await self.adapter.execute(f'PRAGMA journal_mode={self.journal_mode}')
+        if self.synchronous: await self.adapter.execute(f'PRAGMA synchronous={self.synchronous}')
+        await self.adapter.execute(f'CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT, updated_at REAL, expires_at REAL)')
+        async with self.adapter.execute(f'PRAGMA table_info({self.table})') as cur:
+            if 'expires_at' not in {row[1] for row in await cur.fetchall()}:
+                await self.adapter.execute(f'ALTER TABLE {self.table} ADD COLUMN expires_at REAL')
+        await self.adapter.execute(f'CREATE INDEX IF NOT EXISTS {self.table}_expires_at ON {self.table} (expires_at) WHERE expires_at IS NOT NULL')
         await self.adapter.commit()
-        self.logger.info(f'SQLiteProtocol on_start: {self.path} table={self.table}')
+        if self.readers and self.path != ':memory:':
+            self._readers = [await aiosqlite.connect(f'file:{self.path}?mode=ro', uri=True) for _ in range(self.readers)]
+        self.logger.info(f'SQLiteProtocol on_start: {self.path} table={self.table} readers={len(self._readers)}')
+
+    def _reader(self):
+        """Next pooled read connection, or the writer while a write is not committed yet."""
+        if not self._readers or self._writes or self._group is not None: return self.adapter
+        return self._readers[next(self._next_reader) % len(self._readers)]
+
+    @contextmanager
+    def _writing(self):
+        self._writes += 1
+        try: yield
+        finally: self._writes -= 1
+
+    async def _commit(self, ops: int = 1):
+        """Commit now, or join the open group and wait for its shared commit."""
+        if not self.group_commit:
+            await self.adapter.commit(); self.commits += 1
+            return
+        if self._group is None:
+            self._group = asyncio.get_running_loop().create_future()
+            if self._flush_task is None or self._flush_task.done():  # else the running commit picks it up next
+                self._group_timer = asyncio.get_running_loop().call_later(self.commit_window, self._flush_soon)
+        group = self._group
+        self._group_ops += ops
+        if self._group_ops >= self.commit_max_ops: self._flush_soon()
+        await asyncio.shield(group)
+
+    def _flush_soon(self):
+        if self._flush_task is None or self._flush_task.done(): self._flush_task = asyncio.ensure_future(self.flush())
+
+    async def flush(self):
+        """Commit open groups back to back, each releasing its writers, until none is left."""
+        while (group := self._group) is not None:
+            self._group, self._group_ops = None, 0
+            if self._group_timer is not None: self._group_timer.cancel()
+            try:
+                await self.adapter.commit(); self.commits += 1
+                group.set_result(None)
+            except Exception as e: group.set_exception(e)
 
     async def get(self, key: str):
-        async with self.adapter.execute(f'SELECT value FROM {self.table} WHERE key=?', (key,)) as cur:
+        async with self._reader().execute(f'SELECT value FROM {self.table} WHERE key=? AND {self.LIVE}', (key, time.time())) as cur:
             row = await cur.fetchone()
         return json.loads(row[0]) if row else None
 
+    def _chunks(self, keys: list):
+        for i in range(0, len(keys), self.IN_CHUNK):
+            chunk = keys[i:i + self.IN_CHUNK]
+            yield chunk, ','.join('?' * len(chunk))
+
+    async def get_many(self, keys: list) -> dict:
+        values, now = {}, time.time()
+        for chunk, marks in self._chunks(list(keys)):
+            async with self._reader().execute(f'SELECT key, value FROM {self.table} WHERE key IN ({marks}) AND {self.LIVE}', (*chunk, now)) as cur:
+                values.update((k, json.loads(v)) for k, v in await cur.fetchall())
+        return values
+
     async def set(self, key: str, value, ttl: int = None):
-        await self.adapter.execute(f'INSERT OR REPLACE INTO {self.table} (key, value, updated_at) VALUES (?, ?, ?)',
-                                   (key, json.dumps(value, ensure_ascii=False), time.time()))
-        await self.adapter.commit()
+        with self._writing():
+            now = time.time()
+            await self.adapter.execute(f'INSERT OR REPLACE INTO {self.table} (key, value, updated_at, expires_at) VALUES (?, ?, ?, ?)',
+                                       (key, json.dumps(value, ensure_ascii=False), now, None if ttl is None else now + ttl))
+            await self._commit()
 
     async def remove(self, key: str):
-        await self.adapter.execute(f'DELETE FROM {self.table} WHERE key=?', (key,))
-        await self.adapter.commit()
+        with self._writing():
+            await self.adapter.execute(f'DELETE FROM {self.table} WHERE key=?', (key,))
+            await self._commit()
 
     async def exists(self, key: str) -> bool:
-        async with self.adapter.execute(f'SELECT 1 FROM {self.table} WHERE key=? LIMIT 1', (key,)) as cur:
+        async with self._reader().execute(f'SELECT 1 FROM {self.table} WHERE key=? AND {self.LIVE} LIMIT 1', (key, time.time())) as cur:
             return await cur.fetchone() is not None
 
     async def keys(self, pattern: str = '*') -> list:
         if pattern == '*':
-            async with self.adapter.execute(f'SELECT key FROM {self.table}') as cur:
+            async with self._reader().execute(f'SELECT key FROM {self.table} WHERE {self.LIVE}', (time.time(),)) as cur:
                 return [r[0] for r in await cur.fetchall()]
-        async with self.adapter.execute(f'SELECT key FROM {self.table} WHERE key LIKE ?', (pattern.replace('*', '%'),)) as cur:
+        async with self._reader().execute(f'SELECT key FROM {self.table} WHERE key LIKE ? AND {self.LIVE}',
+                                          (pattern.replace('*', '%'), time.time())) as cur:
             return [r[0] for r in await cur.fetchall()]
 
+    async def set_batch(self, items: dict):
+        """One executemany, one transaction."""
+        if not items: return
+        now = time.time()
+        with self._writing():
+            await self.adapter.executemany(f'INSERT OR REPLACE INTO {self.table} (key, value, updated_at, expires_at) VALUES (?, ?, ?, NULL)',
+                                           [(k, json.dumps(v, ensure_ascii=False), now) for k, v in items.items()])
+            await self._commit(len(items))
+
+    async def remove_batch(self, keys: list):
+        """DELETE ... WHERE key IN (...) per IN_CHUNK keys, one transaction."""
+        if not keys: return
+        with self._writing():
+            for chunk, marks in self._chunks(list(keys)):
+                await self.adapter.execute(f'DELETE FROM {self.table} WHERE key IN ({marks})', chunk)
+            await self._commit(len(keys))
+
+    async def sweep(self) -> int:
+        """Delete expired rows, sweep_batch per statement and transaction, yielding to the loop in between."""
+        removed = 0
+        while True:
+            with self._writing():
+                cur = await self.adapter.execute(
+                    f'DELETE FROM {self.table} WHERE rowid IN '
+                    f'(SELECT rowid FROM {self.table} WHERE expires_at <= ? LIMIT ?)', (time.time(), self.sweep_batch))
+                await self._commit(cur.rowcount)
+            removed += cur.rowcount
+            if cur.rowcount < self.sweep_batch: break
+            await asyncio.sleep(0)
+        self.expired += removed
+        return removed
+
+    @mode.Service.task
+    async def _sweeper(self):
+        if not self.sweep_interval: return
+        while not self.should_stop:
+            await self.sleep(self.sweep_interval)
+            if self.should_stop: break
+            try: await self.sweep()
+            except Exception as e: self.logger.error(f'SQLiteProtocol sweep failed: {e!r}')
+
     async def __aexit__(self, *exc_info):
-        if not exc_info[0]: await self.adapter.commit()
+        if not exc_info[0]:
+            await self.flush()
+            await self.adapter.commit()
 
     async def compact(self):
+        await self.flush()
         await self.adapter.execute('VACUUM')
         await self.adapter.commit()
 
     async def on_stop(self) -> None:
         if self.adapter:
+            await self.flush()
+            for reader in self._readers: await reader.close()
+            self._readers = []
             await self.adapter.close()
             self.adapter = None
         await super().on_stop()
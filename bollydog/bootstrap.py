@@ -3,6 +3,9 @@
 Exposes entry method for CLI:
   run()              -> eager start all services, daemon mode
   run(msg)           -> execute single command, then stop
+
+Bootstrap(workers=N) swaps HubService for WorkerPoolHub (see service/workers.py);
+Bootstrap(worker_sock=path) is one such worker: no entrypoints, one UdsService on path.
 """
 import signal
 import tomllib
@@ -38,8 +41,9 @@ class BollydogServices(dict):
 class Bootstrap(mode.Worker):
     supervisor = mode.OneForOneSupervisor()
 
-    def __init__(self, config: str = None, **kwargs):
+    def __init__(self, config: str = None, workers: int = 1, worker_sock: str = None, **kwargs):
         self._config = config
+        self._workers, self._worker_sock = workers, worker_sock
         self._message: Optional[Message] = None
         self.services = self._build_services()
         super().__init__(*self.services.values(), **kwargs)
@@ -61,6 +65,13 @@ class Bootstrap(mode.Worker):
         if self._config:
             with open(self._config, 'rb') as f:
                 merged.update(tomllib.load(f))
+        if self._worker_sock:
+            from bollydog.service.workers import worker_config
+            merged = worker_config(merged, self._worker_sock)
+        elif self._workers > 1:
+            hub_conf = dict(merged.get('bollydog.service.app.HubService', {}))
+            hub_conf.update(module='bollydog.service.workers.WorkerPoolHub', workers=self._workers, config=self._config)
+            merged['bollydog.service.app.HubService'] = hub_conf
         return merged
 
     def _build_services(self) -> 'BollydogServices':
@@ -10,6 +10,29 @@ DOMAIN = 'bollydog'
 # Queue
 QUEUE_MAX_SIZE = int(os.getenv('QUEUE_MAX_SIZE', 1000))
 QUEUE_HISTORY_MAX_SIZE = int(os.getenv('QUEUE_HISTORY_MAX_SIZE', 1000))
+# when full: reject (raise), block (await a free slot up to QUEUE_PUT_TIMEOUT s), drop_oldest (evict oldest lowest-priority PENDING)
+QUEUE_OVERFLOW_POLICY = os.getenv('QUEUE_OVERFLOW_POLICY', 'reject')
+QUEUE_PUT_TIMEOUT = float(os.getenv('QUEUE_PUT_TIMEOUT', 5))
+# lane weights by command priority, "priority:weight,..."; unlisted priorities weigh 1
+QUEUE_LANE_WEIGHTS = {int(p): int(w) for p, w in (i.split(':') for i in os.getenv('QUEUE_LANE_WEIGHTS', '0:1,1:4,2:16').split(',') if i)}
+# durable Queue (protocol under ["bollydog.service.queue.Queue".protocol]): journal group-commit window (s) and key prefix
+QUEUE_WAL_FLUSH_INTERVAL = float(os.getenv('QUEUE_WAL_FLUSH_INTERVAL', 0.01))
+QUEUE_WAL_PREFIX = os.getenv('QUEUE_WAL_PREFIX', 'wal:')
+
+# Session keys expire this many seconds after their last write, 0 = never
+SESSION_TTL = float(os.getenv('SESSION_TTL', 0))
+
+# Hub consumer concurrency, 0 = unbounded
+HUB_MAX_IN_FLIGHT = int(os.getenv('HUB_MAX_IN_FLIGHT', 0))
+HUB_MAX_IN_FLIGHT_PER_APP = int(os.getenv('HUB_MAX_IN_FLIGHT_PER_APP', 0))
+
+# Pools for Commands declaring executor = 'process' | 'thread', 0 = concurrent.futures default size
+EXECUTOR_PROCESS_POOL_SIZE = int(os.getenv('EXECUTOR_PROCESS_POOL_SIZE', 0)) or None
+EXECUTOR_THREAD_POOL_SIZE = int(os.getenv('EXECUTOR_THREAD_POOL_SIZE', 0)) or None
+
+# Multi-process mode (bollydog service --workers N): worker sockets are {WORKERS_SOCK_PATH}.w{i}
+WORKERS_SOCK_PATH = os.getenv('WORKERS_SOCK_PATH', '/tmp/bollydog-worker.sock')
+WORKERS_CHECK_INTERVAL = float(os.getenv('WORKERS_CHECK_INTERVAL', 5))
 
 SERVICE_CONFIG = {
     "bollydog.service.registry.RegistryService": {},
@@ -19,7 +42,8 @@ SERVICE_CONFIG = {
     "bollydog.service.exchange.Exchange": {},
     "bollydog.service.queue.Queue": {},
     "bollydog.service.app.HubService": {
-        "routers": {"TaskCount": ["GET", "/api/ping"]},
+        "routers": {"TaskCount": ["GET", "/api/ping"], "QueueStats": ["GET", "/api/queue/stats"],
+                    "QueueHistory": ["GET", "/api/queue/history"]},
         "depends": ["bollydog.Exchange", "bollydog.Queue"],
     },
     "bollydog.service.executor.ExecuteService": {},
@@ -20,8 +20,8 @@ environs.Env().read_env(os.getcwd() + '/.env', recurse=False, verbose=True)
 class CLI:
 
     @staticmethod
-    def service(config: str = None):
-        Bootstrap(config=config, override_logging=False).run()
+    def service(config: str = None, workers: int = 1):
+        Bootstrap(config=config, workers=workers, override_logging=False).run()
 
     @staticmethod
     def ls(config: str = None):
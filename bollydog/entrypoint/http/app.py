@@ -1,5 +1,4 @@
 import asyncio
-import inspect
 import json
 import logging
 from typing import Type
@@ -15,8 +14,9 @@ from starlette.middleware.sessions import SessionMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse, HTMLResponse, StreamingResponse
 
+from bollydog.exception import ServiceMaxSizeOfQueueError
 from bollydog.globals import hub, services, registry, _hub_ctx_stack
-from bollydog.models.base import BaseCommand
+from bollydog.models.base import BaseCommand, ASYNC_GEN
 from bollydog.models.service import AppService
 
 from .config import (
@@ -24,9 +24,9 @@ from .config import (
     ENTRYPOINT_HTTP_SERVICE_PRIVATE_KEY_PATH, ENTRYPOINT_HTTP_SERVICE_PUBLIC_KEY_PATH,
     ENTRYPOINT_HTTP_SERVICE_LOOP, ENTRYPOINT_HTTP_SERVICE_HTTP,
     ENTRYPOINT_HTTP_SERVICE_LIMIT_CONCURRENCY, ENTRYPOINT_HTTP_SERVICE_LIMIT_MAX_REQUESTS,
-    ENTRYPOINT_HTTP_SERVICE_TIMEOUT_KEEP_ALIVE, ENTRYPOINT_HTTP_SERVICE_BACKLOG,
+    ENTRYPOINT_HTTP_SERVICE_TIMEOUT_KEEP_ALIVE, ENTRYPOINT_HTTP_SERVICE_BACKLOG, ENTRYPOINT_HTTP_SERVICE_RETRY_AFTER,
     ENTRYPOINT_HTTP_MIDDLEWARE_SESSION, ENTRYPOINT_HTTP_MIDDLEWARE_AUTH, ENTRYPOINT_HTTP_MIDDLEWARE_CORS,
-    ENTRYPOINT_HTTP_MIDDLEWARE_SESSIONS_SECRET_KEY,
+    ENTRYPOINT_HTTP_MIDDLEWARE_SESSIONS_SECRET_KEY, ENTRYPOINT_HTTP_SSE_BATCH_SIZE, ENTRYPOINT_HTTP_SSE_BATCH_WAIT,
 )
 from .middleware import base_auth_backend
 
@@ -75,6 +75,12 @@ class HttpHandler:
                 raise NotImplementedError
             message = await hub.dispatch(message)
             result = await message.state
+        except ServiceMaxSizeOfQueueError as e:
+            logging.warning(e)
+            response = JSONResponse({'error': str(e)}, status_code=429,
+                                    headers={'Retry-After': str(ENTRYPOINT_HTTP_SERVICE_RETRY_AFTER)})
+            await response(scope, receive, send)
+            return
         except Exception as e:
             result = {'error': str(e)}
             logging.error(e)
@@ -102,9 +108,10 @@ class SseHandler:
         async def event_stream():
             task = asyncio.create_task(hub.execute(message))
             try:
-                async for value in message.state:
-                    yield f"data: {json.dumps(value, ensure_ascii=False)}\n\n"
+                async for batch in message.state.batches(ENTRYPOINT_HTTP_SSE_BATCH_SIZE, ENTRYPOINT_HTTP_SSE_BATCH_WAIT):
+                    yield ''.join(f"data: {json.dumps(value, ensure_ascii=False)}\n\n" for value in batch)
             finally:
+                message.state.close()  # client gone: stop the generator and free its slot
                 if not task.done(): task.cancel()
 
         response = StreamingResponse(event_stream(), media_type='text/event-stream',
@@ -161,7 +168,7 @@ class HttpService(AppService):
                 _path = f'/api/{_domain}/{cmd_alias}'
             if 'SSE' in _methods:
                 _methods = ['GET']
-                if inspect.isasyncgenfunction(cmd_cls.__call__):
+                if cmd_cls._shape == ASYNC_GEN:
                     _handler = SseHandler(cmd_cls)
                 else:
                     logging.warning(f'{cmd_alias} mapped as SSE but is not async generator, falling back to HTTP')
@@ -17,6 +17,10 @@ ENTRYPOINT_HTTP_SERVICE_LIMIT_CONCURRENCY = int(os.getenv('ENTRYPOINT_HTTP_SERVI
 ENTRYPOINT_HTTP_SERVICE_LIMIT_MAX_REQUESTS = int(os.getenv('ENTRYPOINT_HTTP_SERVICE_LIMIT_MAX_REQUESTS', 2000))
 ENTRYPOINT_HTTP_SERVICE_TIMEOUT_KEEP_ALIVE = int(os.getenv('ENTRYPOINT_HTTP_SERVICE_TIMEOUT_KEEP_ALIVE', 5))
 ENTRYPOINT_HTTP_SERVICE_BACKLOG = int(os.getenv('ENTRYPOINT_HTTP_SERVICE_BACKLOG', 128))
+ENTRYPOINT_HTTP_SERVICE_RETRY_AFTER = int(os.getenv('ENTRYPOINT_HTTP_SERVICE_RETRY_AFTER', 1))
+# SSE: values coalesced into one write, and how long (s) to wait for more once one is ready
+ENTRYPOINT_HTTP_SSE_BATCH_SIZE = int(os.getenv('ENTRYPOINT_HTTP_SSE_BATCH_SIZE', 64))
+ENTRYPOINT_HTTP_SSE_BATCH_WAIT = float(os.getenv('ENTRYPOINT_HTTP_SSE_BATCH_WAIT', 0))
 
 ENTRYPOINT_HTTP_MIDDLEWARE_SESSION = os.getenv('ENTRYPOINT_HTTP_MIDDLEWARE_SESSION', '1') == '1'
 ENTRYPOINT_HTTP_MIDDLEWARE_AUTH = os.getenv('ENTRYPOINT_HTTP_MIDDLEWARE_AUTH', '1') == '1'
@@ -73,7 +73,7 @@ class UdsService(AppService):
             resp = json.dumps({'status': 'ok', 'result': msg.model_dump()}, default=str)
         except Exception as e:
             self.logger.exception(e)
-            resp = json.dumps({'status': 'error', 'error': str(e)})
+            resp = json.dumps({'status': 'error', 'error': str(e), 'type': type(e).__name__})
         _write_frame(writer, resp)
         try:
             await writer.drain()
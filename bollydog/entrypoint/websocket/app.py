@@ -7,6 +7,8 @@ from starlette.applications import Starlette
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from bollydog.entrypoint.websocket.config import ENTRYPOINT_WS_SERVICE_DEBUG, ENTRYPOINT_WS_SERVICE_PORT, ENTRYPOINT_WS_SERVICE_LOG_LEVEL, ENTRYPOINT_WS_SERVICE_HOST
+from bollydog.entrypoint.websocket.config import ENTRYPOINT_WS_SERVICE_RETRY_AFTER, ENTRYPOINT_WS_BATCH_SIZE, ENTRYPOINT_WS_BATCH_WAIT
+from bollydog.exception import ServiceMaxSizeOfQueueError
 from bollydog.globals import hub, registry, _hub_ctx_stack
 from bollydog.models.base import BaseCommand
 from bollydog.models.service import AppService
@@ -21,6 +23,7 @@ class SocketService(AppService):
         self.uvicorn = None
         self.subscribers: Set[WebSocket] = set()
         self.listening: Dict[str, Set[WebSocket]] = {}
+        self.streams: Dict[str, BaseCommand] = {}  # running broadcast streams, joinable by trace_id
 
     async def subscribe(self, websocket: WebSocket):
         await websocket.accept()
@@ -34,11 +37,29 @@ class SocketService(AppService):
             if not self.listening[trace_id]:
                 del self.listening[trace_id]
 
+    @staticmethod
+    async def _send_stream(websocket: WebSocket, trace_id: str, source):
+        async for batch in source.batches(ENTRYPOINT_WS_BATCH_SIZE, ENTRYPOINT_WS_BATCH_WAIT):
+            if len(batch) == 1: await websocket.send_json({'trace_id': trace_id, 'data': batch[0]})
+            else: await websocket.send_json({'trace_id': trace_id, 'batch': batch})
+
+    async def _join(self, websocket: WebSocket, trace_id: str):
+        """Attach to a running broadcast stream, replaying what is still in its window."""
+        message = self.streams.get(trace_id)
+        if message is None:
+            return await websocket.send_json({'trace_id': trace_id, 'error': f"no broadcast stream '{trace_id}'"})
+        self.listening.setdefault(trace_id, set()).add(websocket)
+        await self._send_stream(websocket, trace_id, message.state.subscribe())
+
     async def _send_result(self, websocket: WebSocket, message: BaseCommand):
         message = await hub.dispatch(message)
-        if message.is_async_gen:
-            async for value in message.state:
-                await websocket.send_json({'trace_id': message.trace_id, 'data': value})
+        if message.is_async_gen and message.state.window:
+            self.streams[message.trace_id] = message
+            message.state.add_done_callback(lambda _, trace_id=message.trace_id: self.streams.pop(trace_id, None))
+            await self._send_stream(websocket, message.trace_id, message.state.subscribe())
+        elif message.is_async_gen:
+            try: await self._send_stream(websocket, message.trace_id, message.state)
+            finally: message.state.close()  # no-op once the stream ended
         else:
             result = await message.state
             await websocket.send_json({'trace_id': message.trace_id, 'data': result})
@@ -50,6 +71,12 @@ class SocketService(AppService):
             while True:
                 raw = json.loads(await websocket.receive_text())
                 self.logger.debug(f"received: {raw}")
+                if raw.get('join'):
+                    try: await self._join(websocket, raw['join'])
+                    except Exception as e:
+                        self.logger.warning(e)
+                        await websocket.send_json({'trace_id': raw['join'], 'error': str(e)})
+                    continue
                 name = raw.pop('name', None) or raw.pop('alias', None)
                 try:
                     cmd_cls = registry.resolve(name) if name else None
@@ -64,6 +91,10 @@ class SocketService(AppService):
                 self.listening.setdefault(message.trace_id, set()).add(websocket)
                 try:
                     await self._send_result(websocket, message)
+                except ServiceMaxSizeOfQueueError as e:
+                    self.logger.warning(e)
+                    await websocket.send_json({'trace_id': message.trace_id, 'error': str(e), 'code': 429,
+                                               'retry_after': ENTRYPOINT_WS_SERVICE_RETRY_AFTER})
                 except Exception as e:
                     self.logger.error(e)
                     await websocket.send_json({'trace_id': message.trace_id, 'error': str(e)})
@@ -5,5 +5,10 @@ ENTRYPOINT_WS_SERVICE_HOST = os.getenv('ENTRYPOINT_WS_SERVICE_HOST', '0.0.0.0')
 ENTRYPOINT_WS_SERVICE_DEBUG = os.getenv('ENTRYPOINT_WS_SERVICE_DEBUG', 'False') == 'True'
 ENTRYPOINT_WS_SERVICE_PORT = os.getenv('ENTRYPOINT_WS_SERVICE_PORT', 8001)
 ENTRYPOINT_WS_SERVICE_LOG_LEVEL = os.getenv('ENTRYPOINT_WS_SERVICE_LOG_LEVEL', 'info')
+ENTRYPOINT_WS_SERVICE_RETRY_AFTER = int(os.getenv('ENTRYPOINT_WS_SERVICE_RETRY_AFTER', 1))
+# stream values coalesced into one {'batch': [...]} frame (1 = one {'data': value} frame per value),
+# and how long (s) to wait for more once one is ready
+ENTRYPOINT_WS_BATCH_SIZE = int(os.getenv('ENTRYPOINT_WS_BATCH_SIZE', 1))
+ENTRYPOINT_WS_BATCH_WAIT = float(os.getenv('ENTRYPOINT_WS_BATCH_WAIT', 0))
 
 ENTRYPOINT_WS_SERVICE_CONFIG = {"bollydog.entrypoint.websocket.app.SocketService": {}} if ENTRYPOINT_WS_ENABLED else {}
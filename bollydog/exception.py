@@ -8,3 +8,15 @@ class HandlerTimeOutError(Exception):
 
 class HandlerMaxRetryError(Exception):
     pass
+
+
+class RemoteExecutionError(Exception):
+    pass
+
+
+class StreamSubscriberEvictedError(Exception):
+    pass
+
+
+class StreamClosedError(Exception):
+    pass
@@ -7,20 +7,44 @@ from abc import abstractmethod
 from typing import List, Optional, Any, ClassVar
 
 import mode
-from pydantic import BaseModel, Field, field_serializer, ConfigDict, InstanceOf
+from pydantic import BaseModel, Field, field_serializer, ConfigDict, InstanceOf, PrivateAttr
 
 import os
 from bollydog.utils.base import get_hostname, get_repository_version
-from bollydog.globals import message
+from bollydog.globals import message, _message_ctx_stack
 
 HOSTNAME = get_hostname()
 REPOSITORY_VERSION = get_repository_version()
 COMMAND_EXPIRE_TIME = int(os.getenv('COMMAND_EXPIRE_TIME', 3600))
 COMMAND_DEFAULT_SIGN = int(os.getenv('COMMAND_DEFAULT_SIGN', 1))
 COMMAND_DELIVERY_COUNT = int(os.getenv('COMMAND_DELIVERY_COUNT', 0))
+COMMAND_DEFAULT_PRIORITY = int(os.getenv('COMMAND_DEFAULT_PRIORITY', 1))
+COMMAND_STREAM_MAX_SIZE = int(os.getenv('COMMAND_STREAM_MAX_SIZE', 0))
+COROUTINE, ASYNC_GEN, EVENT = 'coroutine', 'async_gen', 'event'  # execution shapes of a command class
 
 
 from bollydog.models.state import StreamState  # noqa: E402
+from bollydog.models.retry import RetryPolicy  # noqa: E402
+
+_IMMUTABLE = (int, float, str, bool, bytes, tuple, frozenset, type(None))
+# BaseCommand fields seeded directly by BaseCommand.fast_construct
+_SEEDED = frozenset({'created_time', 'update_time', 'iid', 'created_by', 'state', 'trace_id', 'span_id', 'parent_span_id', 'data'})
+_FAST_PLANS: dict = {}
+
+
+def _fast_plan(cls) -> tuple:
+    """(field names, static defaults, [(name, FieldInfo)] needing a factory or copy, private attrs, is_async_gen)."""
+    plan = _FAST_PLANS.get(cls)
+    if plan is None:
+        static, dynamic = {}, []
+        for name, info in cls.model_fields.items():
+            if name in _SEEDED or info.is_required(): continue
+            if info.default_factory is None and isinstance(info.default, _IMMUTABLE): static[name] = info.default
+            else: dynamic.append((name, info))
+        plan = _FAST_PLANS[cls] = (
+            frozenset(cls.model_fields), static, dynamic, cls.__private_attributes__, cls._shape == ASYNC_GEN,
+        )
+    return plan
 
 
 class _ModelMixin(BaseModel):
@@ -47,6 +71,16 @@ class BaseCommand(_ModelMixin):
     module: ClassVar[str]
     alias: ClassVar[str]
     destination: ClassVar[str] = None
+    priority: ClassVar[int] = COMMAND_DEFAULT_PRIORITY  # Queue lane, higher = served more often
+    executor: ClassVar[Optional[str]] = None  # 'process' | 'thread': run __call__ in the runner's pool
+    _shape: ClassVar[str] = COROUTINE  # set once per class in __init_subclass__
+    stream_max_size: ClassVar[int] = COMMAND_STREAM_MAX_SIZE  # async gen: StreamState bound, 0 = unbounded
+    stream_retain: ClassVar[bool] = True  # async gen: keep yielded values for result() / await
+    stream_broadcast: ClassVar[int] = 0  # async gen: ring size of a multicast StreamState, 0 = single consumer
+    step_timeout: ClassVar[Optional[float]] = None  # async gen: max seconds per generator step, within expire_time
+    retry_policy: ClassVar[Optional[RetryPolicy]] = None  # backoff retries, replaces delivery_count when set
+    _retries: int = PrivateAttr(default=0)
+    _deferred: bool = PrivateAttr(default=False)
 
     expire_time: float = Field(default=COMMAND_EXPIRE_TIME)
     # qos: int — removed. All messages go through Queue uniformly.
@@ -70,20 +104,55 @@ class BaseCommand(_ModelMixin):
 
     @property
     def is_async_gen(self) -> bool:
-        return inspect.isasyncgenfunction(type(self).__call__)
+        return type(self)._shape == ASYNC_GEN
 
     def model_post_init(self, __context: Any) -> None:
         super().model_post_init(__context)
-        if self.is_async_gen: self.state = StreamState()
+        cls = type(self)
+        if cls._shape == ASYNC_GEN: self.state = StreamState(cls.stream_max_size, cls.stream_retain, cls.stream_broadcast)
         self.span_id = self.span_id if self.span_id != '--' else self.iid
         if message:
             self.trace_id = message.trace_id
             self.parent_span_id = message.span_id
 
+    @classmethod
+    def fast_construct(cls, **fields) -> 'BaseCommand':
+        """Trusted construction without validation, for values the framework already holds
+        (subscriber handlers, rebuilt commands). Same defaults and trace linkage as cls(**fields);
+        per-class defaults are planned once."""
+        names, static, dynamic, private, is_gen = _FAST_PLANS.get(cls) or _fast_plan(cls)
+        now = int(time.time() * 1000)
+        iid = uuid.uuid4().hex
+        values = {**static, 'created_time': now, 'update_time': now, 'iid': iid, 'created_by': HOSTNAME, 'data': {}}
+        for name, info in dynamic:
+            if name not in fields: values[name] = info.get_default(call_default_factory=True, validated_data=values)
+        extra = {}
+        for name, value in fields.items():
+            if name in names: values[name] = value
+            else: extra[name] = value
+        if 'state' not in fields:
+            values['state'] = StreamState(cls.stream_max_size, cls.stream_retain, cls.stream_broadcast) if is_gen else asyncio.Future()
+        if values.get('span_id', '--') == '--': values['span_id'] = values['iid']
+        current = _message_ctx_stack.top
+        if current is not None:
+            values['trace_id'], values['parent_span_id'] = current.trace_id, current.span_id
+        else:
+            values.setdefault('trace_id', iid)
+            values.setdefault('parent_span_id', '--')
+        if values['created_by'] is None: values['created_by'] = HOSTNAME
+        self = cls.__new__(cls)
+        object.__setattr__(self, '__dict__', values)
+        object.__setattr__(self, '__pydantic_fields_set__', set(fields) - extra.keys())
+        object.__setattr__(self, '__pydantic_extra__', extra)
+        object.__setattr__(self, '__pydantic_private__', {k: v.get_default() for k, v in private.items()} if private else None)
+        return self
+
     def __init_subclass__(cls, abstract: bool = False, **kwargs):
         super().__init_subclass__(**kwargs)
         if 'module' not in cls.__dict__: cls.module = cls.__module__
         if 'alias' not in cls.__dict__: cls.alias = cls.__name__
+        call = cls.__call__
+        cls._shape = ASYNC_GEN if inspect.isasyncgenfunction(call) else getattr(call, 'shape', COROUTINE)
 
     def __str__(self):
         _t = 'Event' if isinstance(self, BaseEvent) else 'Command'
@@ -97,6 +166,7 @@ class BaseEvent(BaseCommand, abstract=True):
 
     async def __call__(self, *args, **kwargs) -> Any:
         self.state.set_result(True)
+    __call__.shape = EVENT
 
 
 class BaseService(mode.Service):
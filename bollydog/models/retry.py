@@ -0,0 +1,48 @@
+"""RetryPolicy: declarative retry schedule for a Command class (BaseCommand.retry_policy)."""
+import random
+from typing import Optional, Tuple, Type
+
+from bollydog.exception import HandlerTimeOutError, HandlerMaxRetryError
+
+EXPONENTIAL, LINEAR, CONSTANT = 'exponential', 'linear', 'constant'
+FULL, EQUAL = 'full', 'equal'
+
+
+class RetryPolicy:
+    """When and how long to wait before running a failed Command again.
+
+    attempts: total runs including the first one.
+    backoff: exponential (base * factor ** n), linear (base * (n + 1)) or constant (base), capped at max_delay.
+    jitter: full (uniform 0..delay), equal (delay / 2 + uniform 0..delay / 2) or None.
+    max_elapsed: no retry is scheduled past this many seconds since the Command was created.
+    retry_on: exception classes worth retrying, anything else fails the Command at once.
+    """
+    __slots__ = ('attempts', 'backoff', 'base', 'factor', 'max_delay', 'jitter', 'max_elapsed', 'retry_on')
+
+    def __init__(self, attempts: int = 3, backoff: str = EXPONENTIAL, base: float = 0.1, factor: float = 2.0,
+                 max_delay: float = 30.0, jitter: Optional[str] = FULL, max_elapsed: Optional[float] = None,
+                 retry_on: Tuple[Type[BaseException], ...] = (TimeoutError, HandlerTimeOutError, HandlerMaxRetryError, ConnectionError)):
+        if backoff not in (EXPONENTIAL, LINEAR, CONSTANT): raise ValueError(f'unknown backoff: {backoff}')
+        if jitter not in (FULL, EQUAL, None): raise ValueError(f'unknown jitter: {jitter}')
+        self.attempts, self.backoff, self.base, self.factor = attempts, backoff, base, factor
+        self.max_delay, self.jitter, self.max_elapsed, self.retry_on = max_delay, jitter, max_elapsed, tuple(retry_on)
+
+    def delay(self, retry: int) -> float:
+        """Seconds to wait before retry number `retry` (0-based)."""
+        if self.backoff == EXPONENTIAL: delay = self.base * self.factor ** retry
+        elif self.backoff == LINEAR: delay = self.base * (retry + 1)
+        else: delay = self.base
+        delay = min(delay, self.max_delay)
+        if self.jitter == FULL: return random.uniform(0, delay)
+        if self.jitter == EQUAL: return delay / 2 + random.uniform(0, delay / 2)
+        return delay
+
+    def next_delay(self, exc: BaseException, retry: int, elapsed: float) -> Optional[float]:
+        """Delay before the next run, or None when the failure is final."""
+        if not isinstance(exc, self.retry_on) or retry + 1 >= self.attempts: return None
+        delay = self.delay(retry)
+        if self.max_elapsed is not None and elapsed + delay > self.max_elapsed: return None
+        return delay
+
+    def __repr__(self):
+        return f'RetryPolicy(attempts={self.attempts}, backoff={self.backoff}, base={self.base}, jitter={self.jitter})'
@@ -29,15 +29,21 @@ class AppService(BaseService, abstract=True):
     routers: ClassVar[dict] = {}
     subscribers: ClassVar[dict] = {}
     depends: ClassVar[list] = []
+    priority: ClassVar[int] = None
+    bulkhead: ClassVar[dict] = None  # {'max_in_flight': n, 'queue_share': 0..1}, enforced by Queue via HubService
+    schedules: ClassVar[dict] = {}  # {command: cron | {'cron': cron, 'kwargs': {...}}}, dispatched by HubService
     protocol = None
 
-    def __init__(self, commands=None, routers=None,
-                 subscribers=None, depends=None, **kwargs):
+    def __init__(self, commands=None, routers=None, subscribers=None, depends=None,
+                 priority=None, bulkhead=None, schedules=None, **kwargs):
         super().__init__(**kwargs)
         self.commands = commands or []
         self.routers = routers or {}
         self.subscribers = subscribers or {}
         self.depends = depends or []
+        self.schedules = schedules or {}
+        if priority is not None: self.priority = priority
+        if bulkhead is not None: self.bulkhead = bulkhead
 
     def add_dependency(self, service: 'BaseService') -> 'BaseService':
         if isinstance(service, Protocol) and self.protocol is None:
@@ -51,9 +57,10 @@ class AppService(BaseService, abstract=True):
         routers = {**(cls.routers or {}), **(conf.pop('routers', None) or {})}
         subscribers = {**(cls.subscribers or {}), **(conf.pop('subscribers', None) or {})}
         depends = [*{*(cls.depends or []), *(conf.pop('depends', None) or [])}]
+        schedules = {**(cls.schedules or {}), **(conf.pop('schedules', None) or {})}
         protocol_conf = conf.pop('protocol', None)
-        service = cls(commands=commands, routers=routers,
-                      subscribers=subscribers, depends=depends, **conf)
+        service = cls(commands=commands, routers=routers, subscribers=subscribers,
+                      depends=depends, schedules=schedules, **conf)
         if svc_alias: service.alias = svc_alias
         service.config = conf
         if protocol_conf: service.add_dependency(_build_protocol(protocol_conf))
@@ -1,15 +1,112 @@
 import asyncio
 import contextvars
 
+from bollydog.exception import StreamClosedError, StreamSubscriberEvictedError
+
+
+class StreamCursor:
+    """One subscriber of a broadcast StreamState, reading the shared ring at its own position."""
+
+    def __init__(self, state: 'StreamState', position: int):
+        self.state, self.position = state, position
+
+    def _check_lag(self):
+        state = self.state
+        if self.position < state._seq - state.window:
+            state.evicted += 1
+            raise StreamSubscriberEvictedError(f'subscriber fell {state._seq - self.position} values behind (window {state.window})')
+
+    async def get_batch(self, max_items: int = 64, max_wait: float = 0.0) -> list:
+        """Same contract as StreamState.get_batch; raises StreamSubscriberEvictedError once the
+        producer has overwritten values this subscriber has not read."""
+        state, batch, deadline = self.state, [], None
+        while len(batch) < max_items:
+            self._check_lag()
+            if self.position < state._seq:
+                end = min(state._seq, self.position + max_items - len(batch))
+                batch.extend(state._ring[i % state.window] for i in range(self.position, end))
+                self.position = end
+                continue
+            if state.done(): break
+            if not batch: await state._pulse.wait(); continue
+            if max_wait <= 0: break
+            if deadline is None: deadline = asyncio.get_running_loop().time() + max_wait
+            try:
+                async with asyncio.timeout_at(deadline): await state._pulse.wait()
+            except TimeoutError: break
+        return batch
+
+    async def batches(self, max_items: int = 64, max_wait: float = 0.0):
+        while batch := await self.get_batch(max_items, max_wait):
+            yield batch
+
+    async def __aiter__(self):
+        async for batch in self.batches():
+            for value in batch: yield value
+
 
 class StreamState(asyncio.Queue):
     """Streaming state for async generator Commands.
-    Duck-types asyncio.Future: add_done_callback strictly mirrors Future's context-capture behavior."""
+    Duck-types asyncio.Future: add_done_callback strictly mirrors Future's context-capture behavior.
+
+    max_size > 0 bounds the buffer once a consumer reads: from the first get() on, put() blocks
+    the generator until that consumer catches up (the end-of-stream marker never blocks). A state
+    that is only awaited (hub.execute, sub-commands) is never read, so it buffers without bound. retain=False keeps no copy of yielded values, so
+    result() / await give None; use it when the stream is only iterated.
+
+    close() is for a consumer that goes away (client disconnect): the next put(), or one
+    blocked on the bound, raises StreamClosedError so the runner stops the generator and
+    frees its Queue slot instead of waiting out expire_time.
+
+    get_batch() / batches() drain every available value at once, for consumers that write
+    one frame per batch instead of one per value.
 
-    def __init__(self):
-        super().__init__()
+    broadcast > 0 switches to multicast: values go to a shared ring of that many slots and
+    every subscribe() gets its own StreamCursor, so one generator serves N listeners. A late
+    subscriber replays what is still in the ring; one that falls a full ring behind is evicted
+    (StreamSubscriberEvictedError). The producer never waits for subscribers, max_size is ignored.
+    Iterating the state itself reads through a default cursor from the start of the window.
+    """
+
+    def __init__(self, max_size: int = 0, retain: bool = True, broadcast: int = 0):
+        super().__init__(0)
+        self.max_size = 0 if broadcast else max_size  # applied by the first get(), see _attach
         self._results, self._done_event, self._exception = [], asyncio.Event(), None
         self._done_callbacks = []
+        self.retain = retain
+        self._ended = False  # end marker consumed by get_batch
+        self.window, self._seq, self.evicted = broadcast, 0, 0
+        self._ring = [None] * broadcast
+        self._pulse = asyncio.Event()  # set + cleared on every broadcast change, wakes all cursors
+        self._cursor = None
+        self.closed = False
+
+    def _attach(self):
+        """A consumer is reading: bound the buffer from now on, the next put() waits for it to drain."""
+        self._maxsize = self.max_size
+
+    async def get(self):
+        self._attach()
+        return await super().get()
+
+    def get_nowait(self):
+        self._attach()
+        return super().get_nowait()
+
+    def close(self):
+        """The only consumer left: release a producer blocked in put(), which then raises StreamClosedError.
+        Broadcast states have other listeners and never block, so they are left alone."""
+        if self.window or self.done() or self.closed: return
+        self.closed, self._maxsize = True, 0
+        while self._putters: self._wakeup_next(self._putters)
+
+    def subscribe(self, replay: bool = True) -> StreamCursor:
+        """New broadcast subscriber; replay=True starts at the oldest value still in the ring."""
+        if not self.window: raise RuntimeError('subscribe() needs a broadcast StreamState')
+        return StreamCursor(self, max(0, self._seq - self.window) if replay else self._seq)
+
+    def _notify_cursors(self):
+        self._pulse.set(); self._pulse.clear()
 
     def add_done_callback(self, callback):
         if self.done():
@@ -22,23 +119,39 @@ class StreamState(asyncio.Queue):
             asyncio.get_event_loop().call_soon(callback, self, context=context)
         self._done_callbacks.clear()
 
+    def _put_end(self):
+        """Enqueue the end marker past the bound, a finished generator must never block."""
+        self._put(None)
+        self._unfinished_tasks += 1
+        self._finished.clear()
+        self._wakeup_next(self._getters)
+
     async def put(self, value):
         if value is None:
             self._done_event.set()
             self._schedule_callbacks()
-        else:
-            self._results.append(value)
+            if self.window: return self._notify_cursors()
+            return self._put_end()
+        if self.retain: self._results.append(value)
+        if self.window:
+            self._ring[self._seq % self.window] = value
+            self._seq += 1
+            return self._notify_cursors()
+        if self.closed: raise StreamClosedError('stream consumer went away')
         await super().put(value)
+        if self.closed: raise StreamClosedError('stream consumer went away')
 
     def set_result(self, result):
         self._results = [result] if not self._results else self._results
         self._done_event.set()
         self._schedule_callbacks()
+        if self.window: self._notify_cursors()
 
     def set_exception(self, exc):
         self._exception = exc
         self._done_event.set()
-        self.put_nowait(None)
+        if self.window: self._notify_cursors()
+        else: self._put_end()
         self._schedule_callbacks()
 
     def done(self): return self._done_event.is_set()
@@ -46,6 +159,7 @@ class StreamState(asyncio.Queue):
     def exception(self): return self._exception
     def result(self):
         if self._exception: raise self._exception
+        if not self.retain and not self._results: return None
         return self._results[0] if len(self._results) == 1 else self._results
 
     @property
@@ -58,7 +172,39 @@ class StreamState(asyncio.Queue):
             return self.result()
         return _wait().__await__()
 
+    async def get_batch(self, max_items: int = 64, max_wait: float = 0.0) -> list:
+        """Wait for one value, then take what is buffered (waiting up to max_wait s for more)
+        until max_items. An empty list means the stream has ended."""
+        if self.window:
+            if self._cursor is None: self._cursor = self.subscribe()
+            return await self._cursor.get_batch(max_items, max_wait)
+        if self._ended: return []
+        first = await self.get()
+        if first is None:
+            self._ended = True; return []
+        batch = [first]
+        deadline = asyncio.get_running_loop().time() + max_wait if max_wait > 0 else None
+        while len(batch) < max_items:
+            if self.empty():
+                if deadline is None: break
+                try:
+                    async with asyncio.timeout_at(deadline): value = await self.get()
+                except TimeoutError: break
+            else: value = self.get_nowait()
+            if value is None:
+                self._ended = True; break
+            batch.append(value)
+        return batch
+
+    async def batches(self, max_items: int = 64, max_wait: float = 0.0):
+        while batch := await self.get_batch(max_items, max_wait):
+            yield batch
+
     async def __aiter__(self):
+        if self.window:
+            async for batch in self.batches():
+                for value in batch: yield value
+            return
         while True:
             value = await self.get()
             if value is None: break
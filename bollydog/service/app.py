@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-from typing import TYPE_CHECKING
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Union
 
 import mode
+from croniter import croniter
 
-from bollydog.config import DOMAIN
-from bollydog.globals import _hub_ctx_stack, services
+from bollydog.config import DOMAIN, HUB_MAX_IN_FLIGHT, HUB_MAX_IN_FLIGHT_PER_APP
+from bollydog.globals import _hub_ctx_stack, registry, services
 from bollydog.models.base import BaseCommand as Message, BaseEvent
 from bollydog.models.service import AppService
-from bollydog.service.runner import CommandRunnerMixin
+from bollydog.service.runner import CommandRunnerMixin, on_home_loop
 
 if TYPE_CHECKING:
     from bollydog.service.exchange import Exchange
@@ -24,13 +27,29 @@ class HubService(CommandRunnerMixin, AppService):
     HubService.run consumer -> queue.take() -> create_task(_process_and_complete)
                             -> _run_with_context -> queue.complete
     execute(msg) = dispatch(msg) + await msg.state
+    dispatch_many(msgs) / gather(msgs) enqueue a batch with one Queue wakeup
+
+    Concurrency: max_in_flight (global), max_in_flight_per_app (each service key)
+    and limits ({destination | domain.alias: n}) are handed to the Queue, whose
+    take() only releases messages with a free slot; excess work stays PENDING
+    instead of becoming live tasks. Sub-commands of an in-flight message bypass
+    the caps so a saturated parent can always finish. Each AppService may also
+    declare a bulkhead (its own max_in_flight and queue_share), so one hot
+    domain cannot take every slot.
+
+    dispatch(msg, not_before=ts) parks the message DELAYED in the Queue's timer heap.
+    Each AppService's schedules ({command: cron}) are dispatched by the scheduler task
+    (schedule=False turns it off, as in multi-process workers).
     """
     domain = DOMAIN
     commands = ['commands']
 
-    def __init__(self, **kwargs):
+    def __init__(self, max_in_flight: int = HUB_MAX_IN_FLIGHT, max_in_flight_per_app: int = HUB_MAX_IN_FLIGHT_PER_APP,
+                 limits: dict = None, schedule: bool = True, **kwargs):
         super().__init__(**kwargs)
         self._exchange = self._queue = None
+        self.max_in_flight, self.max_in_flight_per_app, self.limits = max_in_flight, max_in_flight_per_app, limits or {}
+        self.schedule = schedule
 
     @property
     def exchange(self) -> Exchange:
@@ -45,24 +64,58 @@ class HubService(CommandRunnerMixin, AppService):
         self.exit_stack.enter_context(_hub_ctx_stack.push(self))
 
     async def on_start(self) -> None:
+        limits, shares = dict(self.limits), {}
+        for key, service in services.items():
+            bulkhead = getattr(service, 'bulkhead', None)
+            if not bulkhead: continue
+            if bulkhead.get('max_in_flight'): limits.setdefault(key, bulkhead['max_in_flight'])
+            if bulkhead.get('queue_share'): shares[key] = bulkhead['queue_share']
+        self.queue.set_limits(limits, default=self.max_in_flight_per_app, total=self.max_in_flight, shares=shares)
         await super().on_start()
 
+    async def on_started(self) -> None:
+        await super().on_started()
+        recovered = await self.queue.recover()  # Queue (and its protocol) started as our dependency
+        for message, not_before in recovered:
+            try: await self.dispatch(message, not_before)
+            except Exception as e: self.logger.error(f'recovered {message.alias} {message.iid} not dispatched, kept in the journal: {e!r}')
+        if recovered: self.logger.info(f'recovered {len(recovered)} unfinished messages from the queue journal')
+
     async def _submit(self, message: Message):
         sub = await self.dispatch(message)
         return await sub.state
 
+    async def _submit_many(self, messages) -> list:
+        return await self.gather(messages)
+
+    async def _reschedule(self, message, delay: float) -> bool:
+        """Retries go back through the Queue as delayed messages instead of sleeping in a task."""
+        return self.queue.defer(message.iid, delay) or await super()._reschedule(message, delay)
+
+    @on_home_loop
     async def emit(self, event: Message):
         await self.dispatch(event)
 
+    @on_home_loop
     async def gather(self, commands: list) -> list:
-        subs = [await self.dispatch(cmd) for cmd in commands]
+        subs = await self.dispatch_many(commands)
         return await asyncio.gather(*(sub.state for sub in subs), return_exceptions=True)
 
-    async def dispatch(self, message: Message) -> Message:
+    @on_home_loop
+    async def dispatch(self, message: Message, not_before: Union[float, datetime, None] = None) -> Message:
         self.exchange.bind_subscriber_callbacks(message)
-        await self.queue.put(message)
+        await self.queue.put(message, not_before)
         return message
 
+    @on_home_loop
+    async def dispatch_many(self, messages: list) -> list:
+        """Batch dispatch: subscribers matched once per Event class, one Queue put_many / wakeup."""
+        messages = list(messages)
+        self.exchange.bind_many(messages)
+        await self.queue.put_many(messages)
+        return messages
+
+    @on_home_loop
     async def execute(self, message: Message):
         await self.dispatch(message)
         return await message.state
@@ -73,6 +126,33 @@ class HubService(CommandRunnerMixin, AppService):
             if not message.state.done(): message.state.set_exception(e)
         self.queue.complete(message.iid)
 
+    @staticmethod
+    def _schedule_entries() -> list:
+        """(destination, cron iterator, kwargs) for every service's schedules; bare names are local to the service."""
+        entries, now = [], time.time()
+        for key, service in services.items():
+            for name, spec in (getattr(service, 'schedules', None) or {}).items():
+                spec = {'cron': spec} if isinstance(spec, str) else spec
+                dest = name if name.count('.') >= 2 else f'{key}.{name}'
+                entries.append((dest, croniter(spec['cron'], start_time=now), spec.get('kwargs') or {}))
+        return entries
+
+    @mode.Service.task
+    async def scheduler(self):
+        if not self.schedule: return
+        entries = self._schedule_entries()
+        if not entries: return
+        due = [cron.get_next(float) for _, cron, _ in entries]
+        while not self.should_stop:
+            await self.sleep(max(0.0, min(due) - time.time()))
+            if self.should_stop: break
+            now = time.time()
+            for i, (dest, cron, kwargs) in enumerate(entries):
+                if due[i] > now: continue
+                while due[i] <= now: due[i] = cron.get_next(float)  # missed ticks collapse into one run
+                try: await self.dispatch(registry.resolve(dest)(**kwargs))
+                except Exception as e: self.logger.error(f'schedule {dest} failed: {e!r}')
+
     @mode.Service.task
     async def run(self):
         while not self.should_stop:
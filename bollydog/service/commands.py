@@ -1,6 +1,7 @@
 import asyncio
-from typing import Any
+from typing import Any, Optional
 
+from bollydog.globals import hub
 from bollydog.models.base import BaseCommand
 
 
@@ -8,3 +9,17 @@ class TaskCount(BaseCommand):
 
     async def __call__(self, *args, **kwargs) -> Any:
         return len(asyncio.all_tasks())
+
+
+class QueueStats(BaseCommand):
+
+    async def __call__(self, *args, **kwargs) -> Any:
+        return {**hub.queue.stats, 'executors': hub.executor_stats}
+
+
+class QueueHistory(BaseCommand):
+    command: Optional[str] = None  # alias or destination
+    since: Optional[float] = None  # seconds back
+
+    async def __call__(self, *args, **kwargs) -> Any:
+        return hub.queue.history(self.command, self.since)
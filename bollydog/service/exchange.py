@@ -7,27 +7,102 @@ from bollydog.models.base import BaseEvent
 from bollydog.models.service import AppService
 
 
-def _match(pp, tp, pi, ti):
-    while pi < len(pp):
-        if pp[pi] == '#':
-            if pi == len(pp) - 1: return True
-            for skip in range(ti, len(tp) + 1):
-                if _match(pp, tp, pi + 1, skip): return True
-            return False
-        if ti >= len(tp): return False
-        if pp[pi] != '*' and pp[pi] != tp[ti]: return False
-        pi += 1; ti += 1
-    return ti == len(tp)
+def match_topic(pattern: str, topic: str) -> bool:
+    """AMQP-style: * = one segment, # = zero or more segments.
 
+    Walks the topic once keeping the set of reachable pattern positions, so
+    repeated # costs O(len(pattern) * len(topic)) instead of backtracking.
+    """
+    pp, tp = pattern.split('.'), topic.split('.')
+    states = _skip_hashes(pp, {0})
+    for seg in tp:
+        step = set()
+        for pi in states:
+            if pi == len(pp): continue
+            if pp[pi] == '#': step.add(pi)
+            elif pp[pi] == '*' or pp[pi] == seg: step.add(pi + 1)
+        if not step: return False
+        states = _skip_hashes(pp, step)
+    return len(pp) in states
 
-def match_topic(pattern: str, topic: str) -> bool:
-    """AMQP-style: * = one segment, # = zero or more segments."""
-    return _match(pattern.split('.'), topic.split('.'), 0, 0)
+
+def _skip_hashes(pp, states: set) -> set:
+    """Add positions reachable by letting # match zero segments."""
+    stack = list(states)
+    while stack:
+        pi = stack.pop()
+        if pi < len(pp) and pp[pi] == '#' and pi + 1 not in states:
+            states.add(pi + 1); stack.append(pi + 1)
+    return states
+
+
+class _Node:
+    __slots__ = ('children', 'destinations', 'hash')
+
+    def __init__(self, hash_: bool = False):
+        self.children, self.destinations, self.hash = {}, set(), hash_
+
+
+class TopicTrie:
+    """Segment trie over subscribed patterns; match() walks every pattern at once.
+
+    Active nodes are kept as a set (an NFA walk), a # node stays active on each
+    segment and its subtree is also reachable without consuming one, so any
+    number of # costs O(len(topic) * active nodes).
+    """
+
+    def __init__(self, subscriptions: dict = None):
+        self.root = _Node()
+        for pattern, destinations in (subscriptions or {}).items():
+            for destination in destinations: self.add(pattern, destination)
+
+    def add(self, pattern: str, destination: str):
+        node = self.root
+        for seg in pattern.split('.'):
+            child = node.children.get(seg)
+            if child is None: child = node.children[seg] = _Node(seg == '#')
+            node = child
+        node.destinations.add(destination)
+
+    @staticmethod
+    def _closure(nodes: dict) -> dict:
+        stack = list(nodes.values())
+        while stack:
+            hashed = stack.pop().children.get('#')
+            if hashed is not None and id(hashed) not in nodes:
+                nodes[id(hashed)] = hashed; stack.append(hashed)
+        return nodes
+
+    def match(self, topic: str) -> set:
+        nodes = self._closure({id(self.root): self.root})
+        for seg in topic.split('.'):
+            step = {}
+            for node in nodes.values():
+                if node.hash: step[id(node)] = node
+                for child in (node.children.get(seg), node.children.get('*')):
+                    if child is not None: step[id(child)] = child
+            nodes = self._closure(step)
+            if not nodes: return set()
+        matched = set()
+        for node in nodes.values(): matched.update(node.destinations)
+        return matched
 
 
 class Exchange(AppService):
+    """Routes Events to subscriber handlers.
+
+    match() memoizes topic -> destinations; the cache and the TopicTrie built
+    from registry.subscribers are dropped whenever registry.revision changes
+    (subscribe / unsubscribe / register), so steady state dispatch is one dict
+    lookup and a miss is one trie walk whatever the number of subscriptions.
+    """
     domain = DOMAIN
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._matches: dict = {}
+        self._trie, self._revision = None, None
+
     async def on_started(self) -> None:
         subs = registry.subscribers
         if subs:
@@ -35,12 +110,14 @@ class Exchange(AppService):
             self.logger.info(f'subscribers({sum(len(v) for v in subs.values())}):\n  {lines}')
         await super().on_started()
 
-    def match(self, topic: str) -> set:
-        """Match topic against registry.subscribers, return set of handler destinations."""
-        matched = set()
-        for pattern, destinations in registry.subscribers.items():
-            if pattern == topic or match_topic(pattern, topic):
-                matched.update(destinations)
+    def match(self, topic: str) -> frozenset:
+        """Match topic against registry.subscribers, return handler destinations (memoized)."""
+        if self._revision != registry.revision:
+            self._matches.clear()
+            self._trie, self._revision = TopicTrie(registry.subscribers), registry.revision
+        try: return self._matches[topic]
+        except KeyError: pass
+        matched = self._matches[topic] = frozenset(self._trie.match(topic))
         return matched
 
     def _on_subscriber_done(self, destination, source_message, state):
@@ -48,15 +125,24 @@ class Exchange(AppService):
             if self.should_stop: return
             if state.cancelled() or state.exception(): return
             handler = registry.resolve(destination)
-            command = handler()
+            command = handler.fast_construct()
             command._source = source_message
             self.add_future(hub.dispatch(command))
         except Exception as e:
             self.logger.exception(f'subscriber callback error: {e}')
 
-    def bind_subscriber_callbacks(self, message):
+    def bind_subscriber_callbacks(self, message, destinations: set = None):
         if not isinstance(message, BaseEvent): return
         topic = type(message).destination
         if not topic: return
-        for destination in self.match(topic):
+        for destination in (self.match(topic) if destinations is None else destinations):
             message.state.add_done_callback(partial(self._on_subscriber_done, destination, message))
+
+    def bind_many(self, messages):
+        """bind_subscriber_callbacks for a batch, matching each Event class once."""
+        matched = {}
+        for message in messages:
+            cls = type(message)
+            if not issubclass(cls, BaseEvent) or not cls.destination: continue
+            if cls not in matched: matched[cls] = self.match(cls.destination)
+            if matched[cls]: self.bind_subscriber_callbacks(message, matched[cls])
@@ -5,7 +5,7 @@ from bollydog.config import DOMAIN
 from bollydog.globals import registry
 from bollydog.models.base import BaseCommand as Message
 from bollydog.models.service import AppService
-from bollydog.service.runner import CommandRunnerMixin
+from bollydog.service.runner import CommandRunnerMixin, on_home_loop
 
 
 class ExecuteService(CommandRunnerMixin, AppService):
@@ -24,14 +24,13 @@ class ExecuteService(CommandRunnerMixin, AppService):
         _app = registry.resolve_app(message)
         if _app and not _app._started.is_set(): await _app.maybe_start()
         async with self._with_context(message):
-            runner = self._run_gen if message.is_async_gen else self._run
-            await self._execute(message, runner)
+            await self._execute(message, self._runner(message))
         if message.state.done() and message.state.exception(): raise message.state.exception()
         return message.state.result() if message.state.done() else None
 
+    @on_home_loop
     async def execute(self, message: Message):
         self.logger.info(f'{message.trace_id[:2]}{message.parent_span_id[:2]}:{message.span_id[:2]} {message.alias}')
         async with self._with_context(message):
-            runner = self._run_gen if message.is_async_gen else self._run
-            await self._execute(message, runner)
+            await self._execute(message, self._runner(message))
         return await message.state
@@ -1,67 +1,526 @@
 import asyncio
+import array
+import heapq
+import itertools
 import logging
-from collections import OrderedDict, deque
-from typing import Optional, Tuple
+import time
+from collections import Counter, OrderedDict, defaultdict, deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 
-from bollydog.config import DOMAIN, QUEUE_MAX_SIZE, QUEUE_HISTORY_MAX_SIZE
+import mode
+
+from bollydog.config import (
+    DOMAIN, QUEUE_MAX_SIZE, QUEUE_HISTORY_MAX_SIZE, QUEUE_LANE_WEIGHTS, QUEUE_OVERFLOW_POLICY, QUEUE_PUT_TIMEOUT,
+    QUEUE_WAL_FLUSH_INTERVAL, QUEUE_WAL_PREFIX,
+)
 from bollydog.exception import ServiceMaxSizeOfQueueError
+from bollydog.globals import registry
 from bollydog.models.base import BaseCommand as Message
 from bollydog.models.service import AppService
 
 logger = logging.getLogger(__name__)
 
-PENDING, IN_FLIGHT, DONE, FAILED = 1, 2, 0, 3
+PENDING, IN_FLIGHT, DONE, FAILED, DELAYED = 1, 2, 0, 3, 4
+TOTAL = '*'  # parking key for the global in-flight cap
+REJECT, BLOCK, DROP_OLDEST = 'reject', 'block', 'drop_oldest'
+
+
+class Lane:
+    """FIFO of PENDING iids for one command priority."""
+    __slots__ = ('priority', 'weight', 'ready', 'depth', 'served', 'credit')
+
+    def __init__(self, priority: int, weight: int):
+        self.priority, self.weight = priority, max(int(weight), 1)
+        self.ready, self.depth, self.served, self.credit = deque(), 0, 0, 0
+
+
+def _percentiles(values: list) -> dict:
+    if not values: return {'p50': None, 'p90': None, 'p99': None, 'max': None}
+    values = sorted(values)
+    at = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {'p50': at(0.5), 'p90': at(0.9), 'p99': at(0.99), 'max': values[-1]}
+
+
+class History:
+    """Ring of the last `size` archived messages as compact columns, no message objects retained.
+
+    Per record: alias, destination, status (DONE | FAILED), finished (epoch s),
+    latency (created -> archived, s) and run (taken -> archived, s; 0 if never taken).
+    Numbers live in preallocated arrays, alias/destination are the class-level strings.
+    """
+    __slots__ = ('size', 'head', 'count', 'alias', 'destination', 'status', 'finished', 'latency', 'run')
+
+    def __init__(self, size: int):
+        self.size, self.head, self.count = max(int(size), 1), 0, 0
+        self.alias, self.destination = [None] * self.size, [None] * self.size
+        self.status = array.array('b', bytes(self.size))
+        self.finished, self.latency, self.run = (array.array('d', bytes(8 * self.size)) for _ in range(3))
+
+    def append(self, alias: str, destination: Optional[str], status: int, finished: float, latency: float, run: float):
+        i = self.head
+        self.alias[i], self.destination[i], self.status[i] = alias, destination, status
+        self.finished[i], self.latency[i], self.run[i] = finished, latency, run
+        self.head = (i + 1) % self.size
+        if self.count < self.size: self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def _indexes(self):
+        start = (self.head - self.count) % self.size
+        return ((start + k) % self.size for k in range(self.count))
+
+    def __iter__(self):
+        """Oldest first: (alias, destination, status, finished, latency, run)."""
+        for i in self._indexes():
+            yield self.alias[i], self.destination[i], self.status[i], self.finished[i], self.latency[i], self.run[i]
+
+    def summary(self, command: str = None, since: float = None) -> dict:
+        """Counts, failure rate and latency / run percentiles, overall and per alias.
+        command: only this alias or destination; since: only records finished within the last `since` seconds."""
+        cutoff = time.time() - since if since else None
+        groups: Dict[str, list] = defaultdict(list)
+        for i in self._indexes():
+            if cutoff is not None and self.finished[i] < cutoff: continue
+            if command and command not in (self.alias[i], self.destination[i]): continue
+            groups[self.alias[i]].append(i)
+
+        def _aggregate(indexes):
+            failed = sum(1 for i in indexes if self.status[i] == FAILED)
+            return {'count': len(indexes), 'failed': failed, 'failure_rate': failed / len(indexes) if indexes else 0.0,
+                    'latency': _percentiles([self.latency[i] for i in indexes]),
+                    'run': _percentiles([self.run[i] for i in indexes if self.run[i]])}
+        return {**_aggregate([i for indexes in groups.values() for i in indexes]),
+                'by_alias': {alias: _aggregate(indexes) for alias, indexes in sorted(groups.items())}}
 
 
 class Queue(AppService):
+    """Message buffer between Hub.dispatch and the Hub consumer.
+
+    _store holds every live message (PENDING + IN_FLIGHT) keyed by iid.
+    PENDING iids wait in one Lane per command priority; take() picks a lane by
+    smooth weighted round-robin, so bulk low-priority bursts cannot starve
+    interactive commands. put/take/complete/has_pending stay O(1) in the number
+    of messages (O(lanes) for take).
+
+    When max_size is reached put() follows the overflow policy: reject raises
+    ServiceMaxSizeOfQueueError, block awaits a free slot for up to put_timeout
+    seconds, drop_oldest fails the oldest PENDING message of the lowest lane,
+    messages parked by a concurrency limit included.
+
+    Bulkheads (set_limits shares) cap the PENDING + IN_FLIGHT messages one
+    service key may hold to a fraction of max_size; a put beyond the share is
+    rejected for that service only.
+
+    Concurrency limits (set_limits) cap IN_FLIGHT root messages in total and per
+    destination or service key (domain.alias). A message whose slot is taken is
+    parked while still PENDING and re-queued at the head of its lane on
+    complete(). Nested messages (dispatched by an in-flight command) are never
+    parked, otherwise a parent holding the last slot would wait forever.
+
+    With a protocol (any KVProtocol) the Queue is durable: every root message
+    with a destination is journaled under {QUEUE_WAL_PREFIX}{iid} and removed
+    once archived. Journal writes are group-committed by the flusher every
+    wal_interval seconds with one set_batch + one remove_batch, and a message
+    that completes inside the window never reaches the protocol. recover()
+    rebuilds what a previous run left unfinished; HubService re-dispatches it
+    on start (at-least-once: IN_FLIGHT messages run again). Nested messages are
+    not journaled, their recovered root dispatches them again.
+    """
     domain = DOMAIN
     _store: OrderedDict[str, Tuple[Message, asyncio.Future, int]]
-    _history: deque
+    _lanes: Dict[int, Lane]
+    _pending: int
+    _history: History
     _notify: asyncio.Event
+    _space: asyncio.Event
 
-    def __init__(self, history_size=QUEUE_HISTORY_MAX_SIZE, **kwargs):
+    def __init__(self, max_size=QUEUE_MAX_SIZE, history_size=QUEUE_HISTORY_MAX_SIZE, weights: dict = None,
+                 overflow: str = QUEUE_OVERFLOW_POLICY, put_timeout: float = QUEUE_PUT_TIMEOUT,
+                 wal_interval: float = QUEUE_WAL_FLUSH_INTERVAL, **kwargs):
         super().__init__(**kwargs)
+        if overflow not in (REJECT, BLOCK, DROP_OLDEST): raise ValueError(f'unknown queue overflow policy: {overflow}')
+        self.max_size, self.overflow, self.put_timeout = max_size, overflow, put_timeout
+        self.weights = {int(p): int(w) for p, w in (weights or QUEUE_LANE_WEIGHTS).items()}
         self._store = OrderedDict()
-        self._history = deque(maxlen=history_size)
+        self._lanes = {}
+        self._pending = 0
+        self._history = History(history_size)
+        self._taken: Dict[str, float] = {}  # iid -> time.time() of the last take, for run times
         self._notify = asyncio.Event()
+        self._space = asyncio.Event()
+        self.rejected = self.dropped = 0
+        self._limits, self.default_limit, self.total_limit, self._shares = {}, 0, 0, {}
+        self._keys: Dict[type, Tuple[Optional[str], Optional[str]]] = {}
+        self._running: Counter = Counter()
+        self._queued: Counter = Counter()
+        self._shed: Counter = Counter()
+        self._roots = 0
+        self._parked: Dict[str, deque] = defaultdict(deque)
+        self._delayed: List[Tuple[float, int, str]] = []  # heap of (due loop time, seq, iid) for DELAYED messages
+        self._delay_seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None  # one loop timer, armed for the earliest due entry
+        self.wal_interval = wal_interval
+        self._wal: Dict[str, Optional[Tuple[Message, Optional[float]]]] = {}  # unflushed: iid -> (message, not_before) | None = remove
+        self._logged: set = set()  # iids handed to the protocol and not removed yet
+        self._wal_ready = asyncio.Event()
+        self._wal_lock = asyncio.Lock()
+        self.wal_commits = 0
+
+    def set_limits(self, limits: dict = None, default: int = 0, total: int = 0, shares: dict = None):
+        """Max IN_FLIGHT per destination or service key (default for the rest) and in total; 0 = unbounded.
+        shares: {service key: fraction of max_size it may hold PENDING + IN_FLIGHT}."""
+        self._limits, self.default_limit, self.total_limit = dict(limits or {}), default, total
+        self._shares = {k: max(1, int(self.max_size * float(v))) for k, v in (shares or {}).items()}
+        self._keys.clear()
+
+    def _key_of(self, message: Message) -> Tuple[Optional[str], Optional[str]]:
+        """(limit key, service key) of the message class; limit key is the destination when it has its own limit."""
+        cls = type(message)
+        try: return self._keys[cls]
+        except KeyError: pass
+        dest = cls.destination
+        service_key = '.'.join(dest.split('.')[:2]) if dest else None
+        keys = self._keys[cls] = (dest if dest in self._limits else service_key, service_key)
+        return keys
+
+    def _saturated(self, key: Optional[str]) -> bool:
+        limit = self._limits.get(key, self.default_limit)
+        return bool(limit) and self._running[key] >= limit
 
-    async def put(self, message: Message) -> Message:
-        if len(self._store) >= QUEUE_MAX_SIZE:
-            raise ServiceMaxSizeOfQueueError(f'{message.trace_id[:2]}{message.parent_span_id[:2]}:{message.span_id[:2]} Queue is full')
+    def _lane(self, priority: int) -> Lane:
+        lane = self._lanes.get(priority)
+        if lane is None:
+            lane = self._lanes[priority] = Lane(priority, self.weights.get(priority, 1))
+        return lane
+
+    def _full_error(self, message: Message, reason: str = 'Queue is full') -> ServiceMaxSizeOfQueueError:
+        return ServiceMaxSizeOfQueueError(f'{message.trace_id[:2]}{message.parent_span_id[:2]}:{message.span_id[:2]} {reason}')
+
+    def _is_pending(self, iid: str) -> bool:
+        entry = self._store.get(iid)
+        return entry is not None and entry[2] == PENDING
+
+    def _drop_oldest(self) -> bool:
+        """Parked messages left their lane before the ones still ready, so they are older; the stale
+        ready / parked entries of the dropped message are skipped later like any archived iid."""
+        for _, lane in sorted(self._lanes.items()):
+            while lane.ready and not self._is_pending(lane.ready[0]): lane.ready.popleft()
+            candidates = [next((iid for owner, iid in parked if owner is lane and self._is_pending(iid)), None)
+                          for parked in self._parked.values()]
+            candidates = [iid for iid in candidates if iid is not None] + list(lane.ready)[:1]
+            if not candidates: continue
+            iid = min(candidates, key=lambda i: self._store[i][0].created_time)
+            msg, fut, _ = self._store[iid]
+            lane.depth -= 1
+            self._pending -= 1
+            self.dropped += 1
+            if not fut.done(): fut.set_exception(self._full_error(msg, 'dropped by queue overflow'))
+            self._archive(iid, msg, FAILED)
+            return True
+        return False
+
+    async def _make_room(self, message: Message):
+        if self.overflow == DROP_OLDEST and self._drop_oldest(): return
+        if self.overflow == BLOCK:
+            try:
+                async with asyncio.timeout(self.put_timeout):
+                    while len(self._store) >= self.max_size:
+                        self._space.clear()
+                        await self._space.wait()
+                return
+            except TimeoutError: pass
+        self.rejected += 1
+        raise self._full_error(message)
+
+    async def _admit(self, message: Message, due: Optional[float] = None):
+        """Enqueue without waking the consumer; caller sets _notify. due (loop time) makes it DELAYED."""
+        service_key = self._key_of(message)[1]
+        share = self._shares.get(service_key)
+        if share and self._queued[service_key] >= share:
+            self.rejected += 1
+            self._shed[service_key] += 1
+            raise self._full_error(message, f'bulkhead {service_key} is full')
+        if len(self._store) >= self.max_size: await self._make_room(message)
+        self._queued[service_key] += 1
+        if due is not None:
+            self._store[message.iid] = (message, message.state, DELAYED)
+            return self._schedule(message.iid, due)
         self._store[message.iid] = (message, message.state, PENDING)
-        self._notify.set()
+        lane = self._lane(type(message).priority)
+        lane.ready.append(message.iid)
+        lane.depth += 1
+        self._pending += 1
+
+    async def put(self, message: Message, not_before: Union[float, datetime, None] = None) -> Message:
+        """not_before (epoch seconds or datetime): keep the message DELAYED, costing one heap entry, until then."""
+        if not_before is None:
+            await self._admit(message)
+            self._log(message)
+            self._notify.set()
+            return message
+        if isinstance(not_before, datetime): not_before = not_before.timestamp()
+        await self._admit(message, asyncio.get_running_loop().time() + max(0.0, not_before - time.time()))
+        self._log(message, not_before)
         return message
 
+    async def put_many(self, messages) -> list:
+        """Enqueue a batch with a single consumer wakeup. Overflow and bulkheads apply per message:
+        a rejected one gets the ServiceMaxSizeOfQueueError on its state, the rest are still enqueued."""
+        try:
+            for message in messages:
+                try: await self._admit(message)
+                except ServiceMaxSizeOfQueueError as e:
+                    if not message.state.done(): message.state.set_exception(e)
+                    continue
+                self._log(message)
+        finally:
+            if self._pending: self._notify.set()
+        return messages
+
+    def defer(self, message_id: str, delay: float) -> bool:
+        """IN_FLIGHT -> DELAYED: free its concurrency slot now, back to PENDING after delay seconds.
+        complete() leaves a DELAYED message alone. False if the message is not IN_FLIGHT."""
+        entry = self._store.get(message_id)
+        if not entry or entry[2] != IN_FLIGHT: return False
+        msg, fut, _ = entry
+        self._release(self._key_of(msg)[0], msg.parent_span_id == '--')
+        self._store[message_id] = (msg, fut, DELAYED)
+        self._schedule(message_id, asyncio.get_running_loop().time() + delay)
+        return True
+
+    def _schedule(self, message_id: str, due: float):
+        heapq.heappush(self._delayed, (due, next(self._delay_seq), message_id))
+        if self._delayed[0][2] == message_id: self._arm()
+
+    def _arm(self):
+        """(Re)arm the single timer for the head of the heap."""
+        if self._timer is not None: self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_at(self._delayed[0][0], self._on_due) if self._delayed else None
+
+    def _on_due(self):
+        self._timer = None
+        now, ready = asyncio.get_running_loop().time(), False
+        while self._delayed and self._delayed[0][0] <= now:
+            message_id = heapq.heappop(self._delayed)[2]
+            entry = self._store.get(message_id)
+            if not entry or entry[2] != DELAYED: continue
+            msg, fut, _ = entry
+            self._store[message_id] = (msg, fut, PENDING)
+            lane = self._lane(type(msg).priority)
+            lane.ready.append(message_id)
+            lane.depth += 1
+            self._pending += 1
+            ready = True
+        if ready: self._notify.set()
+        self._arm()
+
+    def _log(self, message: Message, not_before: Optional[float] = None):
+        if self.protocol is None or message.parent_span_id != '--' or not type(message).destination: return
+        self._wal[message.iid] = (message, not_before)
+        self._wal_ready.set()
+
+    def _unlog(self, message_id: str):
+        if message_id in self._logged:
+            self._wal[message_id] = None
+            self._wal_ready.set()
+        else: self._wal.pop(message_id, None)  # put and complete in the same window cancel out
+
+    async def flush(self):
+        """Group-commit the journal: one set_batch for new messages, one remove_batch for archived ones.
+
+        A message whose fields do not serialize is logged and left out of the journal (it still runs,
+        just not durably); if the store fails, the whole batch is kept for the next flush.
+        """
+        async with self._wal_lock:
+            if not self._wal: return
+            batch, self._wal = self._wal, {}
+            puts, removes = {}, [iid for iid, entry in batch.items() if entry is None]
+            for iid, entry in batch.items():
+                if entry is None: continue
+                message, not_before = entry
+                try: fields = message.model_dump(mode='json', exclude={'state'})
+                except Exception as e:
+                    logger.error(f'queue journal: {message.alias} {iid} not serializable, not journaled: {e!r}'); continue
+                puts[iid] = {'destination': type(message).destination, 'not_before': not_before, 'fields': fields}
+            if not puts and not removes: return
+            self._logged.update(puts)  # a completion during the write must queue a remove
+            try:
+                if puts: await self.protocol.set_batch({f'{QUEUE_WAL_PREFIX}{iid}': record for iid, record in puts.items()})
+                if removes: await self.protocol.remove_batch([f'{QUEUE_WAL_PREFIX}{iid}' for iid in removes])
+            except Exception:
+                self._logged.difference_update(puts)
+                for iid in (*puts, *removes): self._wal.setdefault(iid, batch[iid])  # retried on the next flush
+                raise
+            self._logged.difference_update(removes)
+            self.wal_commits += 1
+
+    @mode.Service.task
+    async def _flusher(self):
+        if self.protocol is None: return
+        while not self.should_stop:
+            coro = await self.wait(self._wal_ready.wait())
+            if coro.stopped: break
+            self._wal_ready.clear()
+            await self.sleep(self.wal_interval)  # group-commit window
+            try: await self.flush()
+            except Exception as e: logger.error(f'queue journal flush failed: {e!r}')
+
+    async def recover(self) -> List[Tuple[Message, Optional[float]]]:
+        """Journaled messages a previous run left unfinished, oldest first, as (message, not_before).
+        A record whose destination is gone or whose fields no longer validate is logged and removed."""
+        if self.protocol is None: return []
+        recovered, stale = [], []
+        for key, record in (await self.protocol.get_many(await self.protocol.keys(f'{QUEUE_WAL_PREFIX}*'))).items():
+            try: message = registry.resolve(record['destination'])(**record['fields'])
+            except Exception as e:
+                logger.error(f'queue journal: dropped {key} {record!r}: {e!r}')
+                stale.append(key); continue
+            self._logged.add(message.iid)
+            recovered.append((message, record.get('not_before')))
+        if stale: await self.protocol.remove_batch(stale)
+        return sorted(recovered, key=lambda item: item[0].created_time)
+
     async def on_stop(self) -> None:
+        if self._timer is not None: self._timer.cancel()
+        self._timer = None
         self._notify.set()
+        if self.protocol is not None: await self.flush()
+
+    def _next_lane(self) -> Optional[Lane]:
+        """Smooth weighted round-robin over non-empty lanes; idle lanes bank no credit."""
+        best, total = None, 0
+        for lane in self._lanes.values():
+            if not lane.ready:
+                lane.credit = 0; continue
+            lane.credit += lane.weight
+            total += lane.weight
+            if best is None or lane.credit > best.credit: best = lane
+        if best is not None: best.credit -= total
+        return best
+
+    def _pop(self) -> Optional[Message]:
+        while (lane := self._next_lane()) is not None:
+            while lane.ready:
+                iid = lane.ready.popleft()
+                entry = self._store.get(iid)
+                if entry is None or entry[2] != PENDING: continue
+                msg, fut, _ = entry
+                key, root = self._key_of(msg)[0], msg.parent_span_id == '--'
+                if root:
+                    if self._saturated(key):
+                        self._parked[key].append((lane, iid)); continue
+                    if self.total_limit and self._roots >= self.total_limit:
+                        self._parked[TOTAL].append((lane, iid)); continue
+                    self._roots += 1
+                self._running[key] += 1
+                self._taken[iid] = time.time()
+                self._store[iid] = (msg, fut, IN_FLIGHT)
+                lane.depth -= 1
+                lane.served += 1
+                self._pending -= 1
+                return msg
+        return None
 
     async def take(self) -> Optional[Message]:
         while True:
-            for iid, (msg, fut, status) in self._store.items():
-                if status == PENDING:
-                    self._store[iid] = (msg, fut, IN_FLIGHT)
-                    return msg
+            msg = self._pop()
+            if msg is not None: return msg
             if self.should_stop: return None
             self._notify.clear()
             coro = await self.wait(self._notify.wait())
             if coro.stopped: return None
 
     def _archive(self, message_id: str, msg: Message, status: int):
-        self._store.pop(message_id, None)
-        self._history.append((message_id, msg, status))
+        if self._store.pop(message_id, None) is not None:
+            service_key = self._key_of(msg)[1]
+            self._queued[service_key] -= 1
+            if self._queued[service_key] <= 0: del self._queued[service_key]
+            if self.protocol is not None: self._unlog(message_id)
+        now, cls = time.time(), type(msg)
+        taken = self._taken.pop(message_id, None)
+        self._history.append(cls.alias, cls.destination, status, now, now - msg.created_time / 1000, now - taken if taken else 0.0)
+        self._space.set()
 
     def complete(self, message_id: str):
         """Archive message based on its state outcome. Called by Hub after processing."""
         entry = self._store.get(message_id)
         if not entry: return
-        msg, fut, _ = entry
+        msg, fut, prev = entry
+        if prev == DELAYED: return
+        if prev == PENDING:
+            self._pending -= 1
+            self._lane(type(msg).priority).depth -= 1
+        elif prev == IN_FLIGHT:
+            self._release(self._key_of(msg)[0], msg.parent_span_id == '--')
         status = FAILED if (fut.done() and fut.exception()) else DONE
         self._archive(message_id, msg, status)
 
+    def _release(self, key: Optional[str], root: bool):
+        self._running[key] -= 1
+        if self._running[key] <= 0: del self._running[key]
+        self._unpark(key)
+        if root:
+            self._roots -= 1
+            self._unpark(TOTAL)
+
+    def _unpark(self, key: Optional[str]):
+        parked = self._parked.get(key)
+        while parked:
+            lane, iid = parked.popleft()
+            entry = self._store.get(iid)
+            if entry is None or entry[2] != PENDING: continue
+            lane.ready.appendleft(iid)
+            self._notify.set()
+            break
+        if parked is not None and not parked: del self._parked[key]
+
     @property
     def has_pending(self) -> bool:
-        return any(s == PENDING for _, _, s in self._store.values())
+        return self._pending > 0
 
     @property
     def size(self) -> int:
         return len(self._store)
+
+    @property
+    def in_flight(self) -> dict:
+        """IN_FLIGHT count per limit key."""
+        return dict(self._running)
+
+    @property
+    def parked(self) -> dict:
+        """PENDING messages held back by a saturated limit key."""
+        return {key: len(q) for key, q in self._parked.items()}
+
+    @property
+    def lanes(self) -> dict:
+        """Per-lane metrics: {priority: {'weight', 'depth', 'served'}}."""
+        return {p: {'weight': lane.weight, 'depth': lane.depth, 'served': lane.served}
+                for p, lane in sorted(self._lanes.items())}
+
+    @property
+    def bulkheads(self) -> dict:
+        """Per service key: configured caps and current usage."""
+        keys = {*self._shares, *(k for k in self._limits if k is not None), *(k for k in self._queued if k is not None)}
+        return {key: {'max_in_flight': self._limits.get(key, self.default_limit), 'in_flight': self._running.get(key, 0),
+                      'max_queued': self._shares.get(key, self.max_size), 'queued': self._queued.get(key, 0),
+                      'parked': len(self._parked.get(key, ())), 'rejected': self._shed.get(key, 0)}
+                for key in sorted(keys)}
+
+    def history(self, command: str = None, since: float = None) -> dict:
+        """Aggregates over the history ring, see History.summary."""
+        return {'size': self._history.size, **self._history.summary(command, since)}
+
+    @property
+    def journal(self) -> Optional[dict]:
+        """Durable mode only: unflushed records, records held by the protocol, group commits so far."""
+        if self.protocol is None: return None
+        return {'unflushed': len(self._wal), 'logged': len(self._logged), 'commits': self.wal_commits}
+
+    @property
+    def stats(self) -> dict:
+        return {'size': self.size, 'max_size': self.max_size, 'pending': self._pending, 'delayed': len(self._delayed), 'overflow': self.overflow,
+                'rejected': self.rejected, 'dropped': self.dropped, 'lanes': self.lanes, 'bulkheads': self.bulkheads,
+                'journal': self.journal, 'history': len(self._history)}
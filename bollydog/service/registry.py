@@ -1,4 +1,5 @@
 """RegistryService: centralized command/event binding and subscription index."""
+import itertools
 from collections import defaultdict
 from typing import Dict, Optional, Set, Type
 
@@ -8,6 +9,8 @@ from bollydog.models.base import BaseCommand, BaseEvent
 from bollydog.models.service import AppService
 from mode.utils.imports import smart_import
 
+_revisions = itertools.count(1)
+
 
 class RegistryService(AppService):
     domain = DOMAIN
@@ -16,6 +19,7 @@ class RegistryService(AppService):
         super().__init__(**kwargs)
         self.commands: Dict[str, Type[BaseCommand]] = {}
         self.subscribers: Dict[str, Set[str]] = defaultdict(set)
+        self.revision = next(_revisions)  # bumped on every subscription change, unique across registries
 
     def register(self):
         """Scan all services, populate commands and subscribers."""
@@ -38,7 +42,9 @@ class RegistryService(AppService):
                 if issubclass(_obj, BaseEvent) and 'destination' in _obj.__dict__: continue
                 if not issubclass(_obj, BaseEvent) and '__call__' not in _obj.__dict__: continue
                 dest = f'{key}.{_obj.alias}'
-                bound = _obj if _obj.destination else type(_obj.__name__, (_obj,), {'destination': dest})
+                attrs = {'destination': dest}
+                if service.priority is not None and 'priority' not in _obj.__dict__: attrs['priority'] = service.priority
+                bound = _obj if _obj.destination else type(_obj.__name__, (_obj,), attrs)
                 self.commands[dest] = bound
 
     def _register_subscribers(self, key: str, service: AppService):
@@ -51,20 +57,25 @@ class RegistryService(AppService):
                     raise AttributeError(f"{type(service).__name__} has no method '{method_name}'")
                 dest = f'{key}.{method_name}'
                 async def _call(self, _bm=bound_method): return await _bm(self._source)
-                handler_cls = type(method_name, (BaseCommand,), {
+                attrs = {
                     'destination': dest, 'alias': method_name,
                     'module': type(service).__module__, '_source': None, '__call__': _call,
-                })
+                }
+                if service.priority is not None: attrs['priority'] = service.priority
+                handler_cls = type(method_name, (BaseCommand,), attrs)
                 self.commands[dest] = handler_cls
                 self.subscribers[topic].add(dest)
+        self.revision = next(_revisions)
 
     def subscribe(self, topic: str, dest: str):
         """Runtime subscribe: add topic→dest mapping."""
         self.subscribers[topic].add(dest)
+        self.revision = next(_revisions)
 
     def unsubscribe(self, topic: str, dest: str):
         """Runtime unsubscribe: remove topic→dest mapping."""
         self.subscribers.get(topic, set()).discard(dest)
+        self.revision = next(_revisions)
 
     def resolve(self, destination: str) -> Type[BaseCommand]:
         """Exact destination lookup. Raises KeyError if not found."""
@@ -2,18 +2,86 @@
 
 Subclass must implement:
   _submit(message) -> Any   # route sub-command (Queue pipeline vs inline recursive)
+and may override:
+  _submit_many(messages) -> list  # batch of sub-commands, results or exceptions in order
 
 self.wait() / self.logger / self._stopped come from mode.Service via MRO.
+
+Commands declaring executor = 'process' | 'thread' run their coroutine __call__ in a pool
+owned by the runner instead of on the event loop:
+  thread  -> fresh event loop in a ThreadPoolExecutor worker, app/protocol/message globals kept;
+             hub / ExecuteService calls (execute, dispatch, ...) are sent back to the offloading loop,
+             other loop-bound clients (protocol connections, futures) must not be awaited there
+  process -> ProcessPoolExecutor (spawn); fields are pickled via model_dump and the command is
+             rebuilt (validated) from its importable class, so only fields are visible (no globals)
+Async-generator commands always run on the loop.
 """
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import functools
+import multiprocessing
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Any
+from typing import Any, Dict
 
-from bollydog.exception import HandlerTimeOutError, HandlerMaxRetryError
+from bollydog.config import EXECUTOR_PROCESS_POOL_SIZE, EXECUTOR_THREAD_POOL_SIZE
+from bollydog.exception import HandlerTimeOutError, HandlerMaxRetryError, StreamClosedError
 from bollydog.globals import registry, _protocol_ctx_stack, _message_ctx_stack, _app_ctx_stack
-from bollydog.models.base import BaseCommand as Message
+from bollydog.models.base import BaseCommand as Message, COROUTINE, ASYNC_GEN, EVENT
+
+PROCESS, THREAD = 'process', 'thread'
+_home_loop: contextvars.ContextVar = contextvars.ContextVar('bollydog_home_loop', default=None)
+
+
+def _settle(future: asyncio.Future, source: asyncio.Future):
+    if future.done(): return
+    if source.exception() is not None: future.set_exception(source.exception())
+    else: future.set_result(source.result())
+
+
+def _rehome(message, home: asyncio.AbstractEventLoop):
+    """Give a Command built on a thread-executor loop a state future on the home loop, the outcome is copied back."""
+    state = message.state
+    if not isinstance(state, asyncio.Future) or state.done() or state.get_loop() is home: return
+    origin = state.get_loop()
+    message.state = home.create_future()
+    message.state.add_done_callback(lambda fut: origin.is_closed() or origin.call_soon_threadsafe(_settle, state, fut))
+
+
+def on_home_loop(fn):
+    """Coroutine method that, awaited from a thread-executor Command, runs on the loop that offloaded it."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        home = _home_loop.get()
+        if home is None or home is asyncio.get_running_loop(): return await fn(*args, **kwargs)
+        for arg in args:
+            for item in arg if isinstance(arg, (list, tuple)) else (arg,):
+                if isinstance(item, Message): _rehome(item, home)
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(fn(*args, **kwargs), home))
+    return wrapper
+
+
+def _importable(cls: type) -> type:
+    """First class in the MRO picklable by reference (registry binds commands to dynamic subclasses)."""
+    for klass in cls.__mro__:
+        if klass.__call__ is not cls.__call__: break
+        obj = sys.modules.get(klass.__module__)
+        for part in klass.__qualname__.split('.'):
+            obj = getattr(obj, part, None)
+        if obj is klass: return klass
+    raise TypeError(f'{cls.__name__} is not importable, cannot run in a process pool')
+
+
+async def _build_and_call(cls: type, fields: dict):
+    return await cls.model_validate(fields)()  # validated, so nested models are rebuilt from their dumps
+
+
+def _call_in_process(cls: type, fields: dict):
+    return asyncio.run(_build_and_call(cls, fields))
 
 
 class CommandRunnerMixin:
@@ -21,10 +89,19 @@ class CommandRunnerMixin:
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._before, self._after = [], []
+        self._pools: Dict[str, Executor] = {}
+        self._pool_stats = {
+            kind: {'max_workers': size, 'active': 0, 'submitted': 0, 'completed': 0, 'failed': 0}
+            for kind, size in ((PROCESS, EXECUTOR_PROCESS_POOL_SIZE), (THREAD, EXECUTOR_THREAD_POOL_SIZE))
+        }
+        self._plan = {COROUTINE: self._run, ASYNC_GEN: self._run_gen, EVENT: self._run_event}
 
     async def _submit(self, message: Message) -> Any:
         raise NotImplementedError
 
+    async def _submit_many(self, messages) -> list:
+        return await asyncio.gather(*(self._submit(cmd) for cmd in messages), return_exceptions=True)
+
     def before(self, fn):
         self._before.append(fn); return fn
 
@@ -32,12 +109,13 @@ class CommandRunnerMixin:
         self._after.append(fn); return fn
 
     async def _execute(self, message, runner):
-        for fn in self._before:
+        for fn in () if message._retries else self._before:  # hooks wrap the whole run, not each deferred attempt
             short = await fn(message)
             if short is not None:
                 if not message.state.done(): message.state.set_result(short)
                 return
         await runner(message)
+        if message._deferred: return  # retry rescheduled through the Queue, hooks run on the final attempt
         exc = message.state.exception() if message.state.done() else None
         result = message.state.result() if message.state.done() and not exc else None
         for fn in reversed(self._after):
@@ -49,15 +127,70 @@ class CommandRunnerMixin:
         with (_protocol_ctx_stack.push(_app.protocol if _app else None), _message_ctx_stack.push(message), _app_ctx_stack.push(_app)):
             yield
 
+    def _runner(self, message):
+        """Runner for the command's class shape, computed once in BaseCommand.__init_subclass__."""
+        return self._plan[type(message)._shape]
+
     async def _run_with_context(self, message):
-        runner = self._run_gen if message.is_async_gen else self._run
         async with self._with_context(message):
-            await self._execute(message, runner)
+            await self._execute(message, self._runner(message))
+
+    def _pool(self, kind: str) -> Executor:
+        pool = self._pools.get(kind)
+        if pool is not None: return pool
+        if kind == PROCESS:
+            pool = ProcessPoolExecutor(EXECUTOR_PROCESS_POOL_SIZE, mp_context=multiprocessing.get_context('spawn'))
+        elif kind == THREAD:
+            pool = ThreadPoolExecutor(EXECUTOR_THREAD_POOL_SIZE, thread_name_prefix='bollydog-command')
+        else:
+            raise ValueError(f'unknown executor {kind!r}, expected {PROCESS!r} or {THREAD!r}')
+        self._pool_stats[kind]['max_workers'] = pool._max_workers  # noqa
+        self._pools[kind] = pool
+        return pool
+
+    async def _offload(self, message, kind: str):
+        pool, stats = self._pool(kind), self._pool_stats[kind]
+        if kind == PROCESS:
+            call = (_call_in_process, _importable(type(message)), message.model_dump(exclude={'state'}))
+        else:
+            context = contextvars.copy_context()
+            context.run(_home_loop.set, asyncio.get_running_loop())
+            call = (context.run, asyncio.run, message())
+        stats['submitted'] += 1; stats['active'] += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(pool, *call)
+        except BaseException:
+            stats['failed'] += 1
+            raise
+        finally:
+            stats['active'] -= 1
+        stats['completed'] += 1
+        return result
+
+    def _call(self, message):
+        kind = type(message).executor
+        return self._offload(message, kind) if kind else message()
+
+    @property
+    def executor_stats(self) -> dict:
+        """Per pool: max_workers, active (utilization = active / max_workers), submitted, completed, failed."""
+        return {kind: dict(stats) for kind, stats in self._pool_stats.items()}
+
+    async def on_stop(self) -> None:
+        for pool in self._pools.values(): pool.shutdown(wait=False, cancel_futures=True)
+        self._pools.clear()
+        await super().on_stop()
+
+    async def _reschedule(self, message, delay: float) -> bool:
+        """Wait out a retry delay. True = handed back to the Queue (the runner returns), False = retry inline."""
+        await asyncio.sleep(delay)
+        return False
 
     async def _run(self, message):
+        message._deferred = False
         while True:
             try:
-                result = await asyncio.wait_for(message(), timeout=message.expire_time)
+                result = await asyncio.wait_for(self._call(message), timeout=message.expire_time)
                 if isinstance(result, Message):
                     result.data = {**message.data, **result.data}
                     self.logger.info(f'handoff {message.alias} -> {result.alias}')
@@ -66,41 +199,69 @@ class CommandRunnerMixin:
                     result = coro.result
                 if not message.state.done(): message.state.set_result(result)
                 break
-            except (TimeoutError, HandlerTimeOutError, HandlerMaxRetryError) as e:
-                if message.delivery_count:
+            except Exception as e:
+                policy, timeout = type(message).retry_policy, isinstance(e, (TimeoutError, HandlerTimeOutError, HandlerMaxRetryError))
+                if policy is not None:
+                    delay = policy.next_delay(e, message._retries, time.time() - message.created_time / 1000)
+                    if delay is not None:
+                        message._retries += 1
+                        self.logger.info(f'{message.alias} retry {message._retries} in {delay:.3f}s after {e!r}')
+                        if await self._reschedule(message, delay):
+                            message._deferred = True; break
+                        continue
+                elif timeout and message.delivery_count:
                     self.logger.info(f'{message.alias} retrying {message.delivery_count}')
                     message.delivery_count -= 1; continue
+                if not timeout: self.logger.exception(e)
                 if not message.state.done(): message.state.set_exception(e)
                 break
-            except Exception as e:
-                self.logger.exception(e)
-                if not message.state.done(): message.state.set_exception(e)
-                break
+
+    async def _run_event(self, message):
+        try: await message()
+        except Exception as e:
+            self.logger.exception(e)
+            if not message.state.done(): message.state.set_exception(e)
+
+    @staticmethod
+    async def _step(scope, deadline, idle: float, step):
+        """Await one generator step under the per-step idle timeout, then restore the command deadline."""
+        now = asyncio.get_running_loop().time()
+        scope.reschedule(now + idle if deadline is None else min(deadline, now + idle))
+        try: return await step
+        finally:
+            if not scope.expired(): scope.reschedule(deadline)
 
     async def _run_gen(self, message):
         gen = message()
         feedback, pending = None, []
+        idle = type(message).step_timeout
         try:
-            while True:
-                value = pending.pop() if pending else await asyncio.wait_for(gen.asend(feedback), timeout=message.expire_time)
-                if isinstance(value, (list, tuple)):
-                    gather = asyncio.gather(*(self._submit(cmd) for cmd in value), return_exceptions=True)
-                    coro = await self.wait(gather)
-                    if coro.stopped: break
-                    feedback = coro.result
-                elif isinstance(value, Message):
-                    coro = await self.wait(self._submit(value))
-                    if coro.stopped: break
-                    try: feedback = coro.result
-                    except Exception as exc:
-                        try:
-                            pending.append(await asyncio.wait_for(gen.athrow(exc), timeout=message.expire_time))
-                            feedback = None
-                        except StopAsyncIteration: break
-                else:
-                    feedback = None
-                    await message.state.put(value)
+            async with asyncio.timeout(message.expire_time) as scope:  # one deadline for the whole stream
+                deadline = scope.when()
+                while True:
+                    if pending: value = pending.pop()
+                    elif idle: value = await self._step(scope, deadline, idle, gen.asend(feedback))
+                    else: value = await gen.asend(feedback)
+                    if isinstance(value, (list, tuple)):
+                        coro = await self.wait(self._submit_many(value))
+                        if coro.stopped: break
+                        feedback = coro.result
+                    elif isinstance(value, Message):
+                        coro = await self.wait(self._submit(value))
+                        if coro.stopped: break
+                        try: feedback = coro.result
+                        except Exception as exc:
+                            try:
+                                pending.append(await (self._step(scope, deadline, idle, gen.athrow(exc)) if idle else gen.athrow(exc)))
+                                feedback = None
+                            except StopAsyncIteration: break
+                    else:
+                        feedback = None
+                        await message.state.put(value)  # blocks while a bounded stream's consumer lags
         except StopAsyncIteration: pass
+        except StreamClosedError:
+            self.logger.info(f'{message.alias} stream closed by its consumer')
+            await gen.aclose()
         except Exception as e:
             self.logger.exception(e)
             if not message.state.done(): message.state.set_exception(e)
@@ -1,4 +1,4 @@
-from bollydog.config import DOMAIN
+from bollydog.config import DOMAIN, SESSION_TTL
 from bollydog.models.service import AppService
 
 
@@ -6,11 +6,15 @@ class Session(AppService):
     domain = DOMAIN
     protocol = None
 
+    def __init__(self, ttl: float = SESSION_TTL, **kwargs):
+        super().__init__(**kwargs)
+        self.ttl = ttl or None
+
     async def get(self, key) -> dict:
         return await self.protocol.get(key) or {}
 
     async def set(self, key, data: dict):
-        await self.protocol.set(key, data)
+        await self.protocol.set(key, data, ttl=self.ttl)
 
     async def delete(self, key):
         await self.protocol.remove(key)
@@ -0,0 +1,152 @@
+"""Multi-process Hub: a front Hub forwards messages to N worker processes over UDS.
+
+    bollydog service --config app.toml --workers 4
+
+Front process: entrypoints (HTTP/WS/UDS) + WorkerPoolHub, which replaces HubService.
+Each worker:   a full Bootstrap (own HubService/Queue/Exchange) serving one UdsService socket.
+
+WorkerPoolHub still admits messages through its own Queue (lanes, overflow, limits),
+then forwards each one to the least-loaded worker with the length-prefixed JSON framing
+of entrypoint/uds. Async generator commands, Events, subscriber handlers (they need the
+front Exchange and their _source Event) and commands without a destination run in the
+front process, as does everything while no worker is reachable.
+
+Forwarded results cross the hop as JSON (default=str): dicts, lists and scalars come back
+as they were, anything else as its JSON form or str. A worker error keeps its class when
+it is a bollydog.exception or builtin exception (a full worker Queue still raises
+ServiceMaxSizeOfQueueError), otherwise it becomes RemoteExecutionError.
+"""
+from __future__ import annotations
+
+import asyncio
+import builtins
+import json
+import multiprocessing
+import os
+
+import mode
+
+from bollydog.config import DOMAIN, WORKERS_SOCK_PATH, WORKERS_CHECK_INTERVAL
+from bollydog.entrypoint.uds.app import _read_frame, _write_frame
+from bollydog import exception
+from bollydog.exception import RemoteExecutionError
+from bollydog.models.base import BaseCommand as Message, ASYNC_GEN, EVENT
+from bollydog.service.app import HubService
+
+ENTRYPOINT_SERVICES = (
+    'bollydog.entrypoint.http.app.HttpService',
+    'bollydog.entrypoint.websocket.app.SocketService',
+    'bollydog.entrypoint.uds.app.UdsService',
+)
+
+
+def worker_config(config: dict, sock_path: str) -> dict:
+    """Worker config: front config without entrypoints, schedules or queue journal, plus one UdsService on sock_path."""
+    conf = {k: v for k, v in config.items() if k not in ENTRYPOINT_SERVICES and dict(v).get('module', k) not in ENTRYPOINT_SERVICES}
+    conf['bollydog.entrypoint.uds.app.UdsService'] = {'sock_path': sock_path}
+    hub, queue = 'bollydog.service.app.HubService', 'bollydog.service.queue.Queue'
+    conf[hub] = {**conf.get(hub, {}), 'schedule': False}  # schedules fire once, in the front process
+    if queue in conf: conf[queue] = {k: v for k, v in conf[queue].items() if k != 'protocol'}  # the front Queue journals
+    return conf
+
+
+def _remote_error(resp: dict) -> Exception:
+    """Rebuild a worker's error, keeping bollydog.exception and builtin exception classes."""
+    name = resp.get('type') or ''
+    cls = getattr(exception, name, None) or getattr(builtins, name, None)
+    if isinstance(cls, type) and issubclass(cls, Exception):
+        try: return cls(resp.get('error'))
+        except TypeError: pass  # constructor needs more than a message
+    return RemoteExecutionError(resp.get('error'))
+
+
+def run_worker(config: str, sock_path: str):
+    """Process target: run a standalone Bootstrap serving sock_path."""
+    from bollydog.bootstrap import Bootstrap
+    Bootstrap(config=config, worker_sock=sock_path, override_logging=False).run()
+
+
+class WorkerPoolHub(HubService):
+    domain = DOMAIN
+    alias = 'HubService'  # same service key as the HubService it replaces
+
+    def __init__(self, workers: int = 2, config: str = None, sock_path: str = WORKERS_SOCK_PATH, **kwargs):
+        super().__init__(**kwargs)
+        self.workers, self._config_path, self._sock_path = workers, config, sock_path
+        self._procs: list = [None] * workers
+        self._load = [0] * workers
+        self._ctx = multiprocessing.get_context('spawn')
+
+    def worker_sock(self, i: int) -> str:
+        return f'{self._sock_path}.w{i}'
+
+    def _spawn(self, i: int):
+        proc = self._ctx.Process(target=run_worker, args=(self._config_path, self.worker_sock(i)),
+                                 name=f'bollydog-worker-{i}', daemon=True)
+        proc.start()
+        self._procs[i] = proc
+        self.logger.info(f'worker {i} pid={proc.pid} unix://{self.worker_sock(i)}')
+
+    async def on_start(self) -> None:
+        for i in range(self.workers): self._spawn(i)
+        await super().on_start()
+
+    @mode.Service.timer(WORKERS_CHECK_INTERVAL)
+    async def _check_workers(self):
+        for i, proc in enumerate(self._procs):
+            if proc is not None and not proc.is_alive() and not self.should_stop:
+                self.logger.warning(f'worker {i} exited ({proc.exitcode}), respawning')
+                self._spawn(i)
+
+    def _pick(self) -> int:
+        return min(range(self.workers), key=self._load.__getitem__)
+
+    async def _forward(self, i: int, message: Message):
+        reader, writer = await asyncio.open_unix_connection(self.worker_sock(i))
+        try:
+            kwargs = message.model_dump(exclude={'state'})
+            _write_frame(writer, json.dumps({'command': type(message).destination, 'kwargs': kwargs}, default=str))
+            await writer.drain()
+            resp = json.loads(await _read_frame(reader))
+        finally:
+            writer.close()
+            try: await writer.wait_closed()
+            except Exception: pass
+        if resp.get('status') != 'ok': raise _remote_error(resp)
+        return resp['result']['state'][1]
+
+    @staticmethod
+    def _runs_here(message) -> bool:
+        cls = type(message)
+        return not cls.destination or cls._shape in (ASYNC_GEN, EVENT) or '_source' in cls.__private_attributes__
+
+    async def _run_with_context(self, message):
+        if self._runs_here(message): return await super()._run_with_context(message)
+        i = self._pick()
+        self._load[i] += 1
+        try:
+            result = await self._forward(i, message)
+        except (FileNotFoundError, ConnectionError) as e:
+            self.logger.warning(f'worker {i} unreachable ({e}), running {message.alias} locally')
+            return await super()._run_with_context(message)
+        except Exception as e:
+            if not message.state.done(): message.state.set_exception(e)
+            return
+        finally:
+            self._load[i] -= 1
+        if not message.state.done(): message.state.set_result(result)
+
+    @property
+    def load(self) -> dict:
+        return {self.worker_sock(i): n for i, n in enumerate(self._load)}
+
+    async def on_stop(self) -> None:
+        for proc in self._procs:
+            if proc is not None and proc.is_alive(): proc.terminate()
+        for proc in self._procs:
+            if proc is not None: await asyncio.to_thread(proc.join, 5)
+        for i in range(self.workers):
+            if os.path.exists(self.worker_sock(i)):
+                try: os.unlink(self.worker_sock(i))
+                except OSError: pass
+        await super().on_stop()
@@ -94,6 +94,7 @@ async def test_kv_batch_default_loop():
         assert await proto.get('a') == 1
         await proto.remove_batch(['a'])
         assert await proto.get('a') is None
+        assert await proto.get_many(['a', 'b', 'c']) == {'b': 2}
 
 
 # ─── DialectMixin ─────────────────────────────────────────────
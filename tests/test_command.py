@@ -1,4 +1,9 @@
 """Layer 3: Command unit tests — with context, without Hub."""
+import asyncio
+import time
+
+import pytest
+
 from bollydog.testing import run_command
 from bollydog.models.base import BaseCommand
 
@@ -42,3 +47,64 @@ async def test_command_with_protocol():
         result = await run_command(Store(key='x', value='123'), protocol=proto)
         assert result is True
         assert await proto.get('x') == '123'
+
+
+# ─── fast_construct ───────────────────────────────────────────
+
+class Tagged(BaseCommand):
+    tags: list = []
+    limit: int = 10
+    _note: str = 'private'
+    async def __call__(self) -> int:
+        return self.limit
+
+
+class Stream(BaseCommand):
+    async def __call__(self):
+        yield 1
+
+
+def test_fast_construct_matches_validated_defaults():
+    slow, fast = Tagged(limit=3, extra_key='x'), Tagged.fast_construct(limit=3, extra_key='x')
+    exclude = {'created_time', 'update_time', 'iid', 'span_id', 'trace_id', 'state'}
+    assert fast.model_dump(exclude=exclude) == slow.model_dump(exclude=exclude)
+    assert fast.span_id == fast.iid and fast.parent_span_id == '--'
+    assert fast.model_fields_set == {'limit'}
+    assert fast._note == 'private'
+    assert fast.tags is not Tagged.fast_construct().tags
+
+def test_fast_construct_async_gen_gets_stream_state():
+    from bollydog.models.state import StreamState
+    assert isinstance(Stream.fast_construct().state, StreamState)
+
+async def test_fast_construct_links_trace_to_current_message():
+    from bollydog.globals import _message_ctx_stack
+    parent = Add()
+    with _message_ctx_stack.push(parent):
+        child = Add.fast_construct(a=1)
+    assert (child.trace_id, child.parent_span_id) == (parent.trace_id, parent.span_id)
+    assert await run_command(child) == 1
+
+
+@pytest.mark.slow
+async def test_fast_construct_benchmark():
+    """construct + dispatch + complete throughput, validated vs fast_construct."""
+    from bollydog.testing import run_hub
+
+    def _rate(build, n=20_000):
+        start = time.perf_counter()
+        for _ in range(n): build()
+        return n / (time.perf_counter() - start)
+
+    assert _rate(lambda: Add.fast_construct(a=1, b=2)) > _rate(lambda: Add(a=1, b=2)) * 1.3
+
+    async with run_hub() as hub:
+        bound = type('Add', (Add,), {'destination': 'bollydog.HubService.Add'})
+        rates = {}
+        for name, build in (('validated', bound), ('fast', bound.fast_construct)):
+            start = time.perf_counter()
+            for _ in range(20):
+                msgs = await hub.dispatch_many([build(a=i) for i in range(250)])
+                await asyncio.gather(*(m.state for m in msgs))
+            rates[name] = 5_000 / (time.perf_counter() - start)
+        assert rates['fast'] > rates['validated'] * 0.9
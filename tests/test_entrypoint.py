@@ -87,6 +87,22 @@ def test_http_error_returns_json():
     assert resp.status_code == 200
     assert 'error' in resp.json()
 
+def test_http_queue_full_returns_429():
+    from starlette.testclient import TestClient
+    from starlette.applications import Starlette
+    from bollydog.entrypoint.http.app import HttpHandler
+    from bollydog.exception import ServiceMaxSizeOfQueueError
+
+    app = Starlette()
+    app.add_route('/api/ping', HttpHandler(_PingHttp), methods=['GET'])
+    with patch('bollydog.entrypoint.http.app.hub') as mock_hub:
+        mock_hub.dispatch = AsyncMock(side_effect=ServiceMaxSizeOfQueueError('Queue is full'))
+        client = TestClient(app)
+        resp = client.get('/api/ping')
+    assert resp.status_code == 429
+    assert resp.headers['retry-after'] == '1'
+    assert 'error' in resp.json()
+
 def test_http_html_response():
     from starlette.testclient import TestClient
     from starlette.applications import Starlette
@@ -238,3 +254,56 @@ def test_bootstrap_services_populated():
     b = Bootstrap(override_logging=False)
     assert 'bollydog.HubService' in b.services
     assert 'bollydog.ExecuteService' in b.services
+
+async def test_socket_stream_coalesced_into_batch_frames():
+    from bollydog.entrypoint.websocket.app import SocketService
+
+    class _Tokens(BaseCommand):
+        async def __call__(self):
+            for t in 'abc': yield t
+
+    msg = _Tokens()
+    for t in 'abc': await msg.state.put(t)
+    await msg.state.put(None)
+    ws = AsyncMock()
+    with patch('bollydog.entrypoint.websocket.app.hub') as mock_hub, patch('bollydog.entrypoint.websocket.app.ENTRYPOINT_WS_BATCH_SIZE', 64):
+        mock_hub.dispatch = AsyncMock(return_value=msg)
+        await SocketService()._send_result(ws, msg)
+    ws.send_json.assert_awaited_once_with({'trace_id': msg.trace_id, 'batch': ['a', 'b', 'c']})
+
+async def test_socket_stream_one_data_frame_per_value_by_default():
+    from bollydog.entrypoint.websocket.app import SocketService
+
+    class _Tokens(BaseCommand):
+        async def __call__(self):
+            for t in 'ab': yield t
+
+    msg = _Tokens()
+    for t in 'ab': await msg.state.put(t)
+    await msg.state.put(None)
+    ws = AsyncMock()
+    with patch('bollydog.entrypoint.websocket.app.hub') as mock_hub:
+        mock_hub.dispatch = AsyncMock(return_value=msg)
+        await SocketService()._send_result(ws, msg)
+    assert [c.args[0] for c in ws.send_json.await_args_list] == [{'trace_id': msg.trace_id, 'data': t} for t in 'ab']
+
+def test_sse_stream_coalesced_into_one_write():
+    from starlette.testclient import TestClient
+    from starlette.applications import Starlette
+    from bollydog.entrypoint.http.app import SseHandler
+
+    class _Tokens(BaseCommand):
+        async def __call__(self):
+            for t in 'abc': yield t
+
+    async def _execute(msg):
+        for t in 'abc': await msg.state.put(t)
+        await msg.state.put(None)
+
+    app = Starlette()
+    app.add_route('/api/tokens', SseHandler(_Tokens), methods=['GET'])
+    with patch('bollydog.entrypoint.http.app.hub') as mock_hub:
+        mock_hub.execute = AsyncMock(side_effect=_execute)
+        with TestClient(app).stream('GET', '/api/tokens') as resp:
+            chunks = [c for c in resp.iter_bytes() if c]
+    assert b''.join(chunks) == b'data: "a"\n\ndata: "b"\n\ndata: "c"\n\n'
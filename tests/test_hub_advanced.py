@@ -5,6 +5,9 @@ Commands are defined inline and registered dynamically via registry.commands.
 """
 import asyncio
 import sys, os
+
+import pytest
+from pydantic import BaseModel
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'example'))
 
 from bollydog.globals import services, registry
@@ -100,6 +103,51 @@ async def test_gather_parallel(hub):
     results = await hub.gather([_make(_A), _make(_B), _make(_C)])
     assert sorted(results) == [1, 2, 3]
 
+async def test_fan_out_rejection_stays_per_item(hub):
+    from bollydog.exception import ServiceMaxSizeOfQueueError
+
+    class _Leaf(BaseCommand):
+        async def __call__(self) -> int:
+            await asyncio.sleep(0.01)
+            return 1
+
+    class _Fan(BaseCommand):
+        async def __call__(self):
+            feedback = yield [_make(_Leaf) for _ in range(5)]
+            yield {'feedback': feedback}
+
+    size, hub.queue.max_size = hub.queue.max_size, 4  # the generator holds one slot, three leaves fit
+    try: feedback = (await asyncio.wait_for(hub.execute(_make(_Fan)), 2))['feedback']
+    finally: hub.queue.max_size = size
+    assert feedback[:3] == [1, 1, 1]
+    assert all(isinstance(e, ServiceMaxSizeOfQueueError) for e in feedback[3:])
+
+async def test_dispatch_many_returns_messages(hub):
+    class _Sq(BaseCommand):
+        n: int = 0
+        async def __call__(self) -> int: return self.n * self.n
+
+    msgs = [_make(_Sq, n=i) for i in range(50)]
+    dispatched = await hub.dispatch_many(msgs)
+    assert dispatched == msgs
+    assert [await m.state for m in msgs] == [i * i for i in range(50)]
+
+async def test_dispatch_many_matches_subscribers_once_per_class(hub):
+    class _Batched(BaseEvent):
+        destination = 'test._Batch.Batched'
+
+    registry.subscribe('test._Batch.Batched', 'test._Batch.on_batched')
+    calls = []
+    match = hub.exchange.match
+    hub.exchange.match = lambda topic: calls.append(topic) or match(topic)
+    try:
+        events = await hub.dispatch_many([_Batched() for _ in range(20)])
+    finally:
+        hub.exchange.match = match
+        registry.unsubscribe('test._Batch.Batched', 'test._Batch.on_batched')
+    assert calls == ['test._Batch.Batched']
+    assert all(len(e.state._callbacks) == 1 for e in events)
+
 
 # ─── Async Generator (_run_gen) ───────────────────────────────
 
@@ -142,6 +190,71 @@ async def test_async_gen_parallel_fan_out(hub):
     assert values[-1]['sums'] == [10, 20, 30]
 
 
+async def test_async_gen_deadline_covers_whole_stream(hub):
+    """expire_time bounds the whole generator, not each step."""
+
+    class _Drip(BaseCommand):
+        expire_time: float = 0.1
+        async def __call__(self):
+            for i in range(10):
+                await asyncio.sleep(0.03)
+                yield i
+
+    msg = _make(_Drip)
+    await hub.dispatch(msg)
+    values = [v async for v in msg.state]
+    assert 0 < len(values) < 10
+    with pytest.raises(TimeoutError):
+        await msg.state
+
+
+async def test_async_gen_step_timeout(hub):
+    """step_timeout fails a generator that stalls on one step, within a generous expire_time."""
+    class _Stall(BaseCommand):
+        step_timeout = 0.05
+        async def __call__(self):
+            yield 1
+            await asyncio.sleep(0.02)
+            yield 2
+            await asyncio.sleep(1)
+            yield 3
+
+    msg = _make(_Stall)
+    await hub.dispatch(msg)
+    assert [v async for v in msg.state] == [1, 2]
+    assert isinstance(msg.state.exception(), TimeoutError)
+
+
+@pytest.mark.slow
+async def test_async_gen_streaming_benchmark():
+    """One deadline scope streams several times faster than asyncio.wait_for per step."""
+    import time
+    from bollydog.service.executor import ExecuteService
+
+    class _Tokens(BaseCommand):
+        stream_retain = False
+        async def __call__(self):
+            for i in range(20_000): yield i
+
+    async def _wait_for_per_step(msg):
+        gen = msg()
+        try:
+            while True: await msg.state.put(await asyncio.wait_for(gen.asend(None), timeout=msg.expire_time))
+        except StopAsyncIteration: pass
+        await msg.state.put(None)
+
+    async def _rate(run):
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            await run(_Tokens())
+            best = min(best, time.perf_counter() - start)
+        return 20_000 / best
+
+    before, after = await _rate(_wait_for_per_step), await _rate(ExecuteService()._run_gen)
+    assert after > before * 2
+
+
 # ─── Exchange subscriber ─────────────────────────────────────
 
 async def test_event_triggers_subscriber(hub):
@@ -166,6 +279,113 @@ async def test_event_triggers_subscriber(hub):
     assert len(received) >= 1
 
 
+# ─── Concurrency limits ──────────────────────────────────────
+
+async def test_hub_per_app_limit_caps_concurrency(hub):
+    running, peak = [0], [0]
+
+    class _Capped(BaseCommand):
+        async def __call__(self) -> int:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            return 1
+
+    hub.queue.set_limits({f'{DEST_PREFIX}._Capped': 2})
+    results = await hub.gather([_make(_Capped) for _ in range(8)])
+    assert results == [1] * 8
+    assert peak[0] == 2
+
+async def test_hub_limit_lets_nested_commands_through(hub):
+    class _Child(BaseCommand):
+        async def __call__(self) -> int: return 7
+
+    class _Parent(BaseCommand):
+        async def __call__(self):
+            value = yield _Child()
+            yield value
+
+    _reg(_Child)
+    hub.queue.set_limits(total=1, default=1)
+    msg = _make(_Parent)
+    assert await asyncio.wait_for(hub.execute(msg), 1) == 7
+
+async def test_hub_applies_service_bulkheads(hub):
+    class _Hot(AppService):
+        domain = 'test'
+    services['test._Hot'] = _Hot(bulkhead={'max_in_flight': 2, 'queue_share': 0.5})
+    await hub.on_start()
+    bulkhead = hub.queue.bulkheads['test._Hot']
+    assert bulkhead['max_in_flight'] == 2
+    assert bulkhead['max_queued'] == hub.queue.max_size // 2
+
+async def test_dispatch_not_before(hub):
+    import time
+    class _Later(BaseCommand):
+        async def __call__(self) -> float:
+            return time.time()
+    start = time.time()
+    msg = await hub.dispatch(_make(_Later), not_before=start + 0.05)
+    assert hub.queue.stats['delayed'] == 1
+    assert await asyncio.wait_for(msg.state, 1) >= start + 0.05
+
+async def test_scheduler_dispatches_cron_commands(hub):
+    ticks = []
+    class _Tick(BaseCommand):
+        n: int = 0
+        async def __call__(self) -> None:
+            ticks.append(self.n)
+    _reg(_Tick)
+    class _Cron(AppService):
+        domain = 'test'
+    services['test._Cron'] = _Cron(schedules={f'{DEST_PREFIX}._Tick': {'cron': '* * * * * *', 'kwargs': {'n': 3}}})
+    task = asyncio.create_task(type(hub).scheduler(hub))
+    try:
+        for _ in range(30):
+            if ticks: break
+            await asyncio.sleep(0.1)
+    finally: task.cancel()
+    assert ticks and ticks[0] == 3
+
+def test_schedules_merge_from_toml():
+    class _Cron(AppService):
+        domain = 'test'
+        schedules = {'Ping': '0 * * * *'}
+    svc = _Cron.create_from(schedules={'Report': {'cron': '*/5 * * * *', 'kwargs': {'days': 1}}})
+    assert set(svc.schedules) == {'Ping', 'Report'}
+
+async def test_queue_history_command(hub):
+    from bollydog.service.commands import QueueHistory
+    await hub.execute(registry.resolve(f'{DEST_PREFIX}.TaskCount')())
+    history = await hub.execute(_make(QueueHistory, command='TaskCount', since='60'))
+    assert history['count'] == 1 and history['by_alias']['TaskCount']['failed'] == 0
+    assert history['run']['max'] is not None
+
+async def test_queue_journal_recovers_unfinished_messages(tmp_path):
+    import time
+    from bollydog.testing import run_hub
+    config = tmp_path / 'durable.toml'
+    config.write_text(f'''["bollydog.service.queue.Queue".protocol]
+module = "bollydog.adapters.memory.SQLiteProtocol"
+path = "{tmp_path / 'queue.db'}"
+''')
+    async with run_hub(str(config)) as hub:
+        count = registry.resolve(f'{DEST_PREFIX}.TaskCount')
+        assert await hub.execute(count()) > 0  # finished, not recovered
+        later = await hub.dispatch(count(), not_before=time.time() + 3600)
+    async with run_hub(str(config)) as hub:
+        assert hub.queue.stats['delayed'] == 1
+        (iid, (msg, _, _)), = hub.queue._store.items()
+        assert iid == later.iid and type(msg).destination == f'{DEST_PREFIX}.TaskCount'
+
+async def test_queue_stats_command(hub):
+    from bollydog.service.commands import QueueStats
+    stats = await hub.execute(_make(QueueStats))
+    assert stats['size'] >= 1
+    assert 'lanes' in stats and 'bulkheads' in stats and 'executors' in stats
+
+
 # ─── Hub _run retry/timeout path ──────────────────────────────
 
 async def test_command_retry_on_timeout(hub):
@@ -194,3 +414,176 @@ async def test_command_exception_sets_state(hub):
     import pytest
     with pytest.raises(ValueError, match='kaboom'):
         await hub.execute(_make(_Boom))
+
+
+# ─── Executor pools ───────────────────────────────────────────
+
+class _Fib(BaseCommand):
+    executor = 'process'
+    n: int
+
+    async def __call__(self) -> dict:
+        a, b = 0, 1
+        for _ in range(self.n): a, b = b, a + b
+        return {'fib': a, 'pid': os.getpid()}
+
+
+class _Point(BaseModel):
+    x: int
+    y: int
+
+
+class _Span(BaseCommand):
+    executor = 'process'
+    a: _Point
+    b: _Point
+
+    async def __call__(self) -> int:
+        return abs(self.b.x - self.a.x) + abs(self.b.y - self.a.y)
+
+
+class _ProcessBoom(BaseCommand):
+    executor = 'process'
+
+    async def __call__(self):
+        raise ValueError('boom in worker')
+
+
+async def test_process_executor_runs_out_of_process(hub):
+    result = await hub.execute(_make(_Fib, n=30))
+    assert result['fib'] == 832040
+    assert result['pid'] != os.getpid()
+    stats = hub.executor_stats['process']
+    assert stats['completed'] == 1 and stats['active'] == 0
+    assert stats['max_workers'] >= 1
+
+async def test_process_executor_rebuilds_nested_models(hub):
+    assert await hub.execute(_make(_Span, a=_Point(x=1, y=2), b=_Point(x=4, y=6))) == 7
+
+async def test_process_executor_exception_round_trip(hub):
+    import pytest
+    with pytest.raises(ValueError, match='boom in worker'):
+        await hub.execute(_make(_ProcessBoom))
+    assert hub.executor_stats['process']['failed'] == 1
+
+async def test_thread_executor_keeps_globals(hub):
+    import threading
+    from bollydog.globals import message
+
+    class _Blocking(BaseCommand):
+        executor = 'thread'
+        async def __call__(self):
+            return threading.current_thread().name, message.iid
+
+    msg = _make(_Blocking)
+    name, iid = await hub.execute(msg)
+    assert name.startswith('bollydog-command')
+    assert iid == msg.iid
+    assert hub.executor_stats['thread']['completed'] == 1
+
+async def test_thread_executor_sub_command_runs_on_hub_loop(hub):
+    import threading
+    from bollydog.globals import hub as _hub
+    loop = asyncio.get_running_loop()
+
+    class _Sub(BaseCommand):
+        async def __call__(self):
+            return asyncio.get_running_loop() is loop
+
+    class _Parent(BaseCommand):
+        executor = 'thread'
+        async def __call__(self):
+            on_hub_loop = await _hub.execute(_make(_Sub))
+            return threading.current_thread().name, on_hub_loop
+
+    name, on_hub_loop = await asyncio.wait_for(hub.execute(_make(_Parent)), 2)
+    assert name.startswith('bollydog-command') and on_hub_loop
+
+async def test_process_executor_rejects_local_class(hub):
+    import pytest
+
+    class _Local(BaseCommand):
+        executor = 'process'
+        async def __call__(self): return 1
+
+    with pytest.raises(TypeError, match='not importable'):
+        await hub.execute(_make(_Local))
+
+
+
+# ─── Retry policy ─────────────────────────────────────────────
+
+def test_retry_policy_backoff_curves():
+    from bollydog.models.retry import RetryPolicy
+    assert [RetryPolicy(jitter=None, base=1).delay(n) for n in range(4)] == [1, 2, 4, 8]
+    assert [RetryPolicy(backoff='linear', jitter=None, base=1).delay(n) for n in range(3)] == [1, 2, 3]
+    assert RetryPolicy(jitter=None, base=1, max_delay=5).delay(10) == 5
+    assert all(0 <= RetryPolicy(base=1).delay(3) <= 8 for _ in range(50))
+    assert all(2 <= RetryPolicy(base=1, jitter='equal').delay(2) <= 4 for _ in range(50))
+
+def test_retry_policy_limits():
+    from bollydog.models.retry import RetryPolicy
+    policy = RetryPolicy(attempts=3, jitter=None, base=1, max_elapsed=2.5)
+    assert policy.next_delay(ValueError(), 0, 0) is None  # not retryable
+    assert policy.next_delay(ConnectionError(), 0, 0) == 1
+    assert policy.next_delay(ConnectionError(), 1, 0) == 2
+    assert policy.next_delay(ConnectionError(), 2, 0) is None  # attempts exhausted
+    assert policy.next_delay(ConnectionError(), 1, 1) is None  # would pass max_elapsed
+
+async def test_retry_rescheduled_through_queue(hub):
+    from bollydog.models.retry import RetryPolicy
+    attempts, seen, guarded = [], [], []
+
+    class _Flaky(BaseCommand):
+        retry_policy = RetryPolicy(attempts=3, base=0.05, jitter=None)
+        async def __call__(self) -> str:
+            attempts.append(1)
+            if len(attempts) < 3: raise ConnectionError('down')
+            return 'up'
+
+    @hub.before
+    async def _guard(msg):
+        guarded.append(msg.iid)
+
+    @hub.after
+    async def _audit(msg, result=None, exception=None):
+        seen.append(result)
+
+    msg = _make(_Flaky)
+    await hub.dispatch(msg)
+    await asyncio.sleep(0.02)
+    assert hub.queue.stats['delayed'] == 1
+    assert hub.queue.in_flight.get(hub.queue._key_of(msg)[0], 0) == 0
+    assert await asyncio.wait_for(msg.state, 2) == 'up'
+    assert len(attempts) == 3 and msg._retries == 2
+    assert seen == ['up'] and guarded == [msg.iid]
+
+async def test_retry_gives_up_on_non_retryable(hub):
+    from bollydog.models.retry import RetryPolicy
+    attempts = []
+
+    class _Broken(BaseCommand):
+        retry_policy = RetryPolicy(attempts=5, base=0.01)
+        async def __call__(self):
+            attempts.append(1)
+            raise ValueError('bad input')
+
+    with pytest.raises(ValueError):
+        await hub.execute(_make(_Broken))
+    assert len(attempts) == 1
+
+async def test_retry_inline_in_execute_mode():
+    from bollydog.models.retry import RetryPolicy
+    from bollydog.service.executor import ExecuteService
+    attempts = []
+
+    class _Flaky(BaseCommand):
+        retry_policy = RetryPolicy(attempts=2, base=0.01, jitter=None)
+        async def __call__(self) -> int:
+            attempts.append(1)
+            if len(attempts) == 1: raise TimeoutError()
+            return 1
+
+    msg = _Flaky()
+    await ExecuteService()._run(msg)
+    assert msg.state.result() == 1 and len(attempts) == 2
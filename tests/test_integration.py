@@ -155,3 +155,20 @@ def test_exchange_pattern_subscribe():
         assert 'svc.Handler2' in ex.match('x.y.z')
         assert len(ex.match('x.q.z')) == 1
         assert len(ex.match('x.y.w')) == 0
+
+def test_exchange_match_is_memoized_until_subscriptions_change(monkeypatch):
+    from bollydog.service import exchange
+    calls = []
+    real = exchange.TopicTrie.match
+    monkeypatch.setattr(exchange.TopicTrie, 'match', lambda self, t: calls.append(t) or real(self, t))
+    ex = exchange.Exchange()
+    reg = RegistryService()
+    with _registry_ctx_stack.push(reg):
+        reg.subscribe('x.*.z', 'svc.H1')
+        for _ in range(100): assert ex.match('x.y.z') == {'svc.H1'}
+        assert len(calls) == 1
+        reg.subscribe('x.#', 'svc.H2')
+        assert ex.match('x.y.z') == {'svc.H1', 'svc.H2'}
+    other = RegistryService()
+    with _registry_ctx_stack.push(other):
+        assert ex.match('x.y.z') == set()
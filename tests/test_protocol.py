@@ -1,6 +1,9 @@
 """Layer 2: Protocol standalone tests — async, no Hub."""
+import asyncio
 import time
 
+import pytest
+
 
 async def test_memory_set_get(memory_protocol):
     await memory_protocol.set('k1', {'a': 1})
@@ -25,6 +28,11 @@ async def test_memory_keys(memory_protocol):
     foo_keys = await memory_protocol.keys('foo:*')
     assert set(foo_keys) == {'foo:1', 'foo:2'}
 
+async def test_memory_get_many_skips_expired(memory_protocol):
+    await memory_protocol.set_batch({'a': 1, 'b': 2})
+    await memory_protocol.set('c', 3, ttl=-1)
+    assert await memory_protocol.get_many(['a', 'c', 'x']) == {'a': 1}
+
 async def test_memory_batch_set_remove(memory_protocol):
     await memory_protocol.set_batch({'a': 1, 'b': 2, 'c': 3})
     assert await memory_protocol.get('b') == 2
@@ -71,6 +79,59 @@ async def test_memory_ttl_overwrite_removes_ttl():
         await proto.set('k', 'v2')
         assert 'k' not in proto._expiry
 
+async def test_memory_active_expiry_without_reads():
+    from bollydog.adapters.memory import MemoryProtocol
+    proto = MemoryProtocol(expire_interval=0.01)
+    async with proto:
+        await proto.set('keep', 'v')
+        for i in range(100): await proto.set(f'trace:{i}', {'turns': [i]}, ttl=0.02)
+        await asyncio.sleep(0.1)
+        assert list(proto.adapter) == ['keep']
+        assert proto.stats['expired'] == 100 and not proto._deadlines
+
+async def test_memory_expire_pops_only_due():
+    from bollydog.adapters.memory import MemoryProtocol
+    proto = MemoryProtocol(expire_interval=60)
+    async with proto:
+        for i in range(10): await proto.set(f'old{i}', i, ttl=-1)
+        for i in range(1000): await proto.set(f'new{i}', i, ttl=60)
+        assert proto.expire() == 10
+        assert len(proto._deadlines) == 1000 and len(await proto.keys('old*')) == 0
+
+async def test_memory_rewrites_compact_deadlines():
+    from bollydog.adapters.memory import MemoryProtocol
+    proto = MemoryProtocol(expire_interval=60)
+    async with proto:
+        for i in range(1000): await proto.set('k', i, ttl=60)
+        assert len(proto._deadlines) <= 2 * len(proto._expiry) + 64
+        await proto.set('k', 'v')
+        await proto.remove('k')
+        assert proto.expire() == 0
+
+async def test_memory_accounting():
+    from bollydog.adapters.memory import MemoryProtocol
+    proto = MemoryProtocol()
+    async with proto:
+        assert proto.memory == 0
+        await proto.set('a', {'turns': ['x' * 1000]})
+        big = proto.memory
+        assert big > 1000
+        await proto.set('a', 'small')
+        assert 0 < proto.memory < big
+        await proto.set('b', 'v', ttl=-1)
+        assert proto.expire() == 1
+        await proto.remove('a')
+        assert proto.memory == 0
+
+async def test_session_ttl():
+    from bollydog.adapters.memory import MemoryProtocol
+    from bollydog.service.session import Session
+    session = Session(ttl=60)
+    session.protocol = proto = MemoryProtocol()
+    async with proto:
+        await session.append('trace', 'turns', 'hi')
+        assert 'trace' in proto._expiry and await session.history('trace') == ['hi']
+
 
 async def test_sqlite_standalone():
     """Protocol.__aenter__ triggers maybe_start(), no manual lifecycle needed."""
@@ -185,3 +246,224 @@ async def test_sqlite_compact():
         await proto.set('k', 'v')
         await proto.remove('k')
         await proto.compact()  # VACUUM
+
+
+async def test_sqlite_bulk_operations_chunk_keys():
+    from bollydog.adapters.memory import SQLiteProtocol
+    proto = SQLiteProtocol(path=':memory:')
+    proto.IN_CHUNK = 7
+    async with proto:
+        await proto.set_batch({f'k{i}': {'i': i} for i in range(30)})
+        assert proto.commits == 1
+        values = await proto.get_many([f'k{i}' for i in range(0, 40, 2)])
+        assert values == {f'k{i}': {'i': i} for i in range(0, 30, 2)}
+        await proto.remove_batch([f'k{i}' for i in range(25)])
+        assert proto.commits == 2
+        assert sorted(await proto.keys()) == sorted(f'k{i}' for i in range(25, 30))
+        assert await proto.get_many([]) == {}
+    await proto.stop()
+
+
+async def test_sqlite_read_pool(tmp_path):
+    import asyncio
+    from bollydog.adapters.memory import SQLiteProtocol
+    proto = SQLiteProtocol(path=str(tmp_path / 'kv.db'), readers=2, group_commit=True, commit_window=0.05)
+    async with proto:
+        assert len(proto._readers) == 2 and proto._reader() is not proto._reader()
+        write = asyncio.ensure_future(proto.set('k', 1))
+        await asyncio.sleep(0.01)
+        assert proto._reader() is proto.adapter  # uncommitted write: read from the writer
+        assert await proto.get('k') == 1
+        await write
+        assert proto._reader() in proto._readers
+        assert await proto.get('k') == 1 and await proto.get_many(['k']) == {'k': 1}
+        assert await proto.exists('k') and await proto.keys('k*') == ['k']
+    await proto.stop()
+    assert proto._readers == []
+
+async def test_sqlite_read_pool_needs_a_file():
+    from bollydog.adapters.memory import SQLiteProtocol
+    proto = SQLiteProtocol(path=':memory:', readers=2)
+    async with proto:
+        assert proto._readers == [] and proto._reader() is proto.adapter
+    await proto.stop()
+
+
+async def test_sqlite_ttl_hides_expired_rows():
+    from bollydog.adapters.memory import SQLiteProtocol
+    proto = SQLiteProtocol(path=':memory:')
+    async with proto:
+        await proto.set('gone', 1, ttl=-1)
+        await proto.set('live', 2, ttl=60)
+        await proto.set('forever', 3)
+        assert await proto.get('gone') is None and not await proto.exists('gone')
+        assert await proto.get('live') == 2
+        assert sorted(await proto.keys()) == ['forever', 'live']
+        assert await proto.get_many(['gone', 'live']) == {'live': 2}
+        await proto.set('gone', 4)  # rewritten without ttl: lives again
+        assert await proto.get('gone') == 4
+    await proto.stop()
+
+async def test_sqlite_sweep_in_bounded_batches():
+    from bollydog.adapters.memory import SQLiteProtocol
+    proto = SQLiteProtocol(path=':memory:', sweep_batch=3)
+    async with proto:
+        for i in range(10): await proto.set(f'k{i}', i, ttl=-1)
+        await proto.set('live', 1, ttl=60)
+        commits = proto.commits
+        assert await proto.sweep() == 10
+        assert proto.commits - commits == 4 and proto.expired == 10
+        async with proto.adapter.execute('SELECT count(*) FROM kv') as cur:
+            assert (await cur.fetchone())[0] == 1
+        async with proto.adapter.execute('EXPLAIN QUERY PLAN SELECT rowid FROM kv WHERE expires_at <= 1') as cur:
+            assert 'kv_expires_at' in ' '.join(str(row) for row in await cur.fetchall())
+    await proto.stop()
+
+async def test_sqlite_sweeper_task():
+    import asyncio
+    from bollydog.adapters.memory import SQLiteProtocol
+    proto = SQLiteProtocol(path=':memory:', sweep_interval=0.02)
+    async with proto:
+        await proto.set('k', 1, ttl=0.01)
+        await asyncio.sleep(0.1)
+        assert proto.expired == 1
+    await proto.stop()
+
+async def test_sqlite_migrates_table_without_expires_at(tmp_path):
+    import sqlite3
+    from bollydog.adapters.memory import SQLiteProtocol
+    path = str(tmp_path / 'old.db')
+    db = sqlite3.connect(path)
+    db.execute('CREATE TABLE kv (key TEXT PRIMARY KEY, value TEXT, updated_at REAL)')
+    db.execute("INSERT INTO kv VALUES ('old', '1', 0)")
+    db.commit(); db.close()
+    proto = SQLiteProtocol(path=path)
+    async with proto:
+        assert await proto.get('old') == 1
+        await proto.set('new', 2, ttl=-1)
+        assert await proto.keys() == ['old']
+    await proto.stop()
+
+
+# ─── SQLite group commit ─────────────────────────────────────
+
+async def test_sqlite_pragmas(tmp_path):
+    from bollydog.adapters.memory import SQLiteProtocol
+    proto = SQLiteProtocol(path=str(tmp_path / 'default.db'))
+    async with proto:
+        async with proto.adapter.execute('PRAGMA journal_mode') as cur:
+            assert (await cur.fetchone())[0] == 'delete'
+    await proto.stop()
+    proto = SQLiteProtocol(path=str(tmp_path / 'kv.db'), journal_mode='wal', synchronous='normal')
+    async with proto:
+        async with proto.adapter.execute('PRAGMA journal_mode') as cur:
+            assert (await cur.fetchone())[0] == 'wal'
+        async with proto.adapter.execute('PRAGMA synchronous') as cur:
+            assert (await cur.fetchone())[0] == 1
+    await proto.stop()
+    with pytest.raises(ValueError):
+        SQLiteProtocol(journal_mode='fast')
+
+async def test_sqlite_group_commit_shares_transactions(tmp_path):
+    import asyncio, sqlite3
+    from bollydog.adapters.memory import SQLiteProtocol
+    path = str(tmp_path / 'kv.db')
+    proto = SQLiteProtocol(path=path, group_commit=True, commit_window=0.02)
+    async with proto:
+        await asyncio.gather(*(proto.set(f'k{i}', i) for i in range(50)))
+        assert proto.commits == 1
+        reader = sqlite3.connect(path)  # writers return only once their commit is durable
+        assert reader.execute('SELECT count(*) FROM kv').fetchone()[0] == 50
+        await proto.remove_batch(['k0', 'k1'])
+        assert reader.execute('SELECT count(*) FROM kv').fetchone()[0] == 48
+        reader.close()
+    await proto.stop()
+
+async def test_sqlite_group_commit_max_ops(tmp_path):
+    import asyncio
+    from bollydog.adapters.memory import SQLiteProtocol
+    proto = SQLiteProtocol(path=str(tmp_path / 'kv.db'), group_commit=True, commit_window=10, commit_max_ops=5)
+    async with proto:
+        await asyncio.wait_for(asyncio.gather(*(proto.set(f'k{i}', i) for i in range(5))), 1)
+        assert proto.commits == 1
+    await proto.stop()
+
+
+@pytest.mark.slow
+async def test_sqlite_group_commit_benchmark(tmp_path):
+    """50 writers with jittered arrival: writes/sec and commits, per-write commit vs group commit."""
+    import asyncio, random
+    from bollydog.adapters.memory import SQLiteProtocol
+
+    async def _rate(name, **kwargs):
+        proto = SQLiteProtocol(path=str(tmp_path / f'{name}.db'), **kwargs)
+        async with proto:
+            async def _writer(w):
+                for i in range(40):
+                    await proto.set(f'k{w}:{i}', {'i': i})
+                    await asyncio.sleep(random.random() * 0.001)
+            start = time.perf_counter()
+            await asyncio.gather(*(_writer(w) for w in range(50)))
+            rate = 2000 / (time.perf_counter() - start)
+        await proto.stop()
+        return rate, proto.commits
+
+    legacy, legacy_commits = await _rate('legacy')
+    group, group_commits = await _rate('group', group_commit=True, commit_window=0.001)
+    assert group_commits < legacy_commits / 4
+    assert group > legacy * 0.8
+
+
+@pytest.mark.slow
+async def test_sqlite_bulk_flush_benchmark(tmp_path):
+    """TableCacheLayer flush + cold load of 5k keys: native bulk ops vs the KVProtocol per-key loop."""
+    from bollydog.adapters._base import KVProtocol
+    from bollydog.adapters.composite import TableCacheLayer
+    from bollydog.adapters.memory import SQLiteProtocol
+
+    class _Looping(SQLiteProtocol):
+        get_many, set_batch, remove_batch = KVProtocol.get_many, KVProtocol.set_batch, KVProtocol.remove_batch
+
+    async def _elapsed(cls, name):
+        layer = TableCacheLayer(flush_threshold=10**6)
+        layer.add_dependency(cls(path=str(tmp_path / f'{name}.db')))
+        async with layer:
+            for i in range(5000): await layer.set(f'row:{i}', {'i': i})
+            start = time.perf_counter()
+            await layer.flush()
+            layer._cache.clear()
+            await layer.load()
+            elapsed = time.perf_counter() - start
+            assert len(layer._cache) == 5000
+        await layer.stop()
+        return elapsed
+
+    assert await _elapsed(SQLiteProtocol, 'bulk') * 5 < await _elapsed(_Looping, 'loop')
+
+
+@pytest.mark.slow
+async def test_sqlite_read_pool_benchmark(tmp_path):
+    """8 readers (get_many of 200 keys) against one writer: throughput with and without the read pool."""
+    import asyncio, random
+    from bollydog.adapters.memory import SQLiteProtocol
+
+    async def _rates(readers):
+        proto = SQLiteProtocol(path=str(tmp_path / f'r{readers}.db'), journal_mode='wal', readers=readers)
+        async with proto:
+            await proto.set_batch({f'k{i}': {'i': i} for i in range(20_000)})
+            reads, done = 0, asyncio.Event()
+            async def _reader():
+                nonlocal reads
+                while not done.is_set():
+                    assert len(await proto.get_many([f'k{i}' for i in random.sample(range(20_000), 200)])) == 200
+                    reads += 1
+            tasks = [asyncio.ensure_future(_reader()) for _ in range(8)]
+            start = time.perf_counter()
+            for i in range(200): await proto.set(f'w{i % 50}', i)
+            done.set(); await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - start
+        await proto.stop()
+        return reads / elapsed, 200 / elapsed
+
+    single, pooled = await _rates(0), await _rates(4)
+    assert pooled[0] > single[0] * 0.7 and pooled[1] > single[1] * 0.7
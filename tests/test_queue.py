@@ -0,0 +1,466 @@
+"""Queue tests — standalone Queue, no Hub."""
+import asyncio
+import time
+
+import pytest
+
+from bollydog.exception import ServiceMaxSizeOfQueueError
+from bollydog.models.base import BaseCommand
+from bollydog.service.queue import Queue, PENDING, IN_FLIGHT, DONE, FAILED, DELAYED
+
+
+class _Job(BaseCommand):
+    n: int = 0
+    async def __call__(self) -> int:
+        return self.n
+
+class _Bulk(_Job):
+    priority = 0
+
+class _Interactive(_Job):
+    priority = 2
+
+class _Durable(_Job):
+    destination = 'test.Durable._Durable'
+
+
+async def test_put_take_fifo():
+    q = Queue()
+    a, b = await q.put(_Job(n=1)), await q.put(_Job(n=2))
+    assert q.has_pending
+    assert await q.take() is a
+    assert await q.take() is b
+    assert not q.has_pending
+    assert q._store[a.iid][2] == IN_FLIGHT
+
+async def test_complete_archives_status():
+    q = Queue()
+    ok, bad = await q.put(_Job()), await q.put(_Job())
+    await q.take(); await q.take()
+    ok.state.set_result(1)
+    bad.state.set_exception(ValueError('x'))
+    q.complete(ok.iid); q.complete(bad.iid)
+    assert q.size == 0
+    assert [status for _, _, status, *_ in q._history] == [DONE, FAILED]
+
+async def test_history_ring_keeps_compact_records():
+    from bollydog.service.queue import History
+    h = History(3)
+    for i in range(5): h.append(f'a{i}', None, DONE, float(i), 0.1, 0.05)
+    assert len(h) == 3 and [r[0] for r in h] == ['a2', 'a3', 'a4']
+    assert h.finished.typecode == 'd' and len(h.finished) == 3
+
+async def test_history_summary():
+    q = Queue()
+    for i in range(10):
+        msg = await q.put(_Interactive(n=i) if i % 2 else _Job(n=i))
+        await q.take()
+        if i in (1, 3, 5): msg.state.set_exception(ValueError('x'))
+        else: msg.state.set_result(i)
+        q.complete(msg.iid)
+    summary = q.history()
+    assert summary['count'] == 10 and summary['failed'] == 3 and summary['failure_rate'] == 0.3
+    assert summary['by_alias']['_Interactive']['failure_rate'] == 0.6
+    assert (summary['by_alias']['_Job']['count'], summary['by_alias']['_Job']['failed']) == (5, 0)
+    assert 0 <= summary['latency']['p50'] <= summary['latency']['p99'] <= summary['latency']['max']
+    assert q.history(command='_Job')['count'] == 5
+    assert q.history(since=60)['count'] == 10
+    assert q.stats['history'] == 10 and not q._taken
+
+async def test_complete_pending_clears_has_pending():
+    q = Queue()
+    msg = await q.put(_Job())
+    assert q._store[msg.iid][2] == PENDING
+    q.complete(msg.iid)
+    assert not q.has_pending
+    assert q.size == 0
+
+async def test_put_full_raises():
+    q = Queue(max_size=1)
+    await q.put(_Job())
+    with pytest.raises(ServiceMaxSizeOfQueueError):
+        await q.put(_Job())
+
+
+async def test_put_many_wakes_consumer_once():
+    q = Queue()
+    sets = []
+    q._notify.set = lambda: sets.append(1)
+    msgs = await q.put_many([_Job(n=i) for i in range(100)])
+    assert len(sets) == 1
+    assert [(await q.take()).n for _ in range(100)] == list(range(100))
+    assert msgs[0].n == 0
+
+async def test_put_many_rejects_past_capacity():
+    q = Queue(max_size=3)
+    msgs = await q.put_many([_Job(n=i) for i in range(5)])
+    assert q.size == 3 and q.has_pending
+    assert q._notify.is_set()
+    assert [m.iid in q._store for m in msgs] == [True, True, True, False, False]
+    for m in msgs[3:]:
+        with pytest.raises(ServiceMaxSizeOfQueueError): m.state.result()
+
+async def test_defer_frees_slot_then_requeues():
+    q = Queue()
+    q.set_limits(total=1)
+    msg = await q.put(_Job(n=1))
+    other = await q.put(_Job(n=2))
+    assert await q.take() is msg
+    assert q.defer(msg.iid, 0.02)
+    q.complete(msg.iid)  # Hub completes after the runner returns, a DELAYED message stays
+    assert q._store[msg.iid][2] == DELAYED and q.stats['delayed'] == 1
+    assert await q.take() is other
+    q.complete(other.iid)
+    assert await asyncio.wait_for(q.take(), 1) is msg
+    assert q.stats['delayed'] == 0
+
+async def test_put_not_before_costs_a_heap_entry():
+    q = Queue()
+    late = await q.put(_Job(n=2), not_before=time.time() + 0.06)
+    early = await q.put(_Job(n=1), not_before=time.time() + 0.03)
+    now = await q.put(_Job(n=0))
+    assert q._store[late.iid][2] == DELAYED and q._pending == 1
+    assert q.stats['delayed'] == 2 and q.size == 3
+    assert q._timer.when() == q._delayed[0][0]  # one timer, armed for the earliest entry
+    assert await q.take() is now
+    assert await asyncio.wait_for(q.take(), 1) is early
+    assert await asyncio.wait_for(q.take(), 1) is late
+    assert q._timer is None and q.stats['delayed'] == 0
+
+async def test_put_not_before_in_the_past_is_due_at_once():
+    from datetime import datetime, timedelta
+    q = Queue()
+    msg = await q.put(_Job(), not_before=datetime.now() - timedelta(seconds=5))
+    assert await asyncio.wait_for(q.take(), 1) is msg
+
+async def test_defer_requires_in_flight():
+    q = Queue()
+    msg = await q.put(_Job())
+    assert not q.defer(msg.iid, 0.01)
+    assert not q.defer('missing', 0.01)
+
+
+# ─── Overflow policy ─────────────────────────────────────────
+
+async def test_overflow_block_waits_for_slot():
+    q = Queue(max_size=1, overflow='block', put_timeout=1)
+    first = await q.put(_Job())
+    await q.take()
+    waiter = asyncio.create_task(q.put(_Job()))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    first.state.set_result(0)
+    q.complete(first.iid)
+    second = await waiter
+    assert q._store[second.iid][2] == PENDING
+
+async def test_overflow_block_times_out():
+    q = Queue(max_size=1, overflow='block', put_timeout=0.02)
+    await q.put(_Job())
+    with pytest.raises(ServiceMaxSizeOfQueueError):
+        await q.put(_Job())
+    assert q.rejected == 1
+
+async def test_overflow_drop_oldest_lowest_lane():
+    q = Queue(max_size=2, overflow='drop_oldest')
+    bulk, job = await q.put(_Bulk()), await q.put(_Job())
+    newest = await q.put(_Interactive())
+    assert bulk.iid not in q._store
+    with pytest.raises(ServiceMaxSizeOfQueueError, match='dropped'):
+        bulk.state.result()
+    assert {job.iid, newest.iid} == set(q._store)
+    assert q.dropped == 1 and q.lanes[0]['depth'] == 0
+
+async def test_overflow_drop_oldest_includes_parked():
+    q = Queue(max_size=3, overflow='drop_oldest')
+    q.set_limits(default=1)
+    cls = _bound(_Job, 'a.Svc.Job')
+    running, parked = await q.put(cls()), await q.put(cls())
+    assert await _drain(q) == [running] and q.parked == {'a.Svc': 1}
+    ready = await q.put(_Job())
+    await q.put(_Job())
+    assert parked.iid not in q._store and ready.iid in q._store
+    with pytest.raises(ServiceMaxSizeOfQueueError, match='dropped'):
+        parked.state.result()
+    running.state.set_result(0)
+    q.complete(running.iid)
+    assert await q.take() is ready  # the stale parked entry is skipped
+
+async def test_overflow_drop_oldest_rejects_when_all_in_flight():
+    q = Queue(max_size=1, overflow='drop_oldest')
+    await q.put(_Job()); await q.take()
+    with pytest.raises(ServiceMaxSizeOfQueueError):
+        await q.put(_Job())
+
+def test_overflow_unknown_policy():
+    with pytest.raises(ValueError):
+        Queue(overflow='spill')
+
+
+
+# ─── Concurrency limits ──────────────────────────────────────
+
+def _bound(cls, destination):
+    return type(cls.__name__, (cls,), {'destination': destination})
+
+async def _drain(q):
+    out = []
+    while q._pending and (msg := q._pop()) is not None: out.append(msg)
+    return out
+
+async def test_limit_per_service_key_parks_pending():
+    q = Queue()
+    q.set_limits(default=2)
+    slow, other = _bound(_Job, 'a.Svc.Job'), _bound(_Job, 'b.Svc.Job')
+    for _ in range(5): await q.put(slow())
+    await q.put(other())
+    taken = await _drain(q)
+    assert [type(m) for m in taken].count(slow) == 2
+    assert other in [type(m) for m in taken]
+    assert q.in_flight == {'a.Svc': 2, 'b.Svc': 1}
+    assert q.parked == {'a.Svc': 3}
+    assert q.has_pending
+
+async def test_limit_released_on_complete():
+    q = Queue()
+    q.set_limits({'a.Svc.Job': 1})
+    cls = _bound(_Job, 'a.Svc.Job')
+    first, second = await q.put(cls()), await q.put(cls())
+    assert await _drain(q) == [first]
+    first.state.set_result(0)
+    q.complete(first.iid)
+    assert await q.take() is second
+    assert q.in_flight == {'a.Svc.Job': 1}
+
+async def test_limit_total():
+    q = Queue()
+    q.set_limits(total=3)
+    for i in range(5): await q.put(_bound(_Job, f'x.S{i}.Job')())
+    taken = await _drain(q)
+    assert len(taken) == 3
+    taken[0].state.set_result(0)
+    q.complete(taken[0].iid)
+    assert len(await _drain(q)) == 1
+
+async def test_limit_skips_nested_messages():
+    q = Queue()
+    q.set_limits(total=1, default=1)
+    cls = _bound(_Job, 'a.Svc.Job')
+    await q.put(cls())
+    await q.put(cls(parent_span_id='abc'))
+    assert len(await _drain(q)) == 2
+
+
+async def test_bulkhead_queue_share_rejects_only_hot_service():
+    q = Queue(max_size=10)
+    q.set_limits(shares={'hot.Svc': 0.3})
+    hot, cold = _bound(_Job, 'hot.Svc.Job'), _bound(_Job, 'cold.Svc.Job')
+    for _ in range(3): await q.put(hot())
+    with pytest.raises(ServiceMaxSizeOfQueueError, match='bulkhead hot.Svc'):
+        await q.put(hot())
+    for _ in range(5): await q.put(cold())
+    stats = q.bulkheads
+    assert stats['hot.Svc'] == {'max_in_flight': 0, 'in_flight': 0, 'max_queued': 3,
+                                'queued': 3, 'parked': 0, 'rejected': 1}
+    assert stats['cold.Svc']['queued'] == 5
+
+async def test_bulkhead_share_frees_on_complete():
+    q = Queue(max_size=10)
+    q.set_limits(shares={'hot.Svc': 0.1})
+    cls = _bound(_Job, 'hot.Svc.Job')
+    msg = await q.put(cls())
+    await q.take()
+    msg.state.set_result(0)
+    q.complete(msg.iid)
+    await q.put(cls())
+    assert q.stats['bulkheads']['hot.Svc']['queued'] == 1
+
+
+# ─── Priority lanes ──────────────────────────────────────────
+
+async def test_lanes_weighted_share():
+    q = Queue(weights={0: 1, 2: 3}, max_size=1000)
+    for _ in range(200):
+        await q.put(_Bulk()); await q.put(_Interactive())
+    taken = [type(await q.take()).priority for _ in range(100)]
+    assert taken.count(2) == 75
+    assert taken.count(0) == 25
+
+async def test_interactive_not_starved_by_bulk_burst():
+    q = Queue(max_size=2000)
+    for _ in range(1000): await q.put(_Bulk())
+    fast = [await q.put(_Interactive()) for _ in range(10)]
+    order = [(await q.take()).iid for _ in range(20)]
+    assert all(m.iid in order for m in fast)
+
+async def test_lanes_fifo_within_priority():
+    q = Queue()
+    msgs = [await q.put(_Job(n=i)) for i in range(5)]
+    assert [await q.take() for _ in range(5)] == msgs
+
+async def test_lane_metrics():
+    q = Queue(weights={'0': 2})
+    await q.put(_Bulk()); await q.put(_Bulk()); await q.put(_Job())
+    await q.take()
+    lanes = q.lanes
+    assert lanes[0]['weight'] == 2
+    assert lanes[0]['depth'] + lanes[1]['depth'] == 2
+    assert lanes[0]['served'] + lanes[1]['served'] == 1
+
+async def test_idle_lane_banks_no_credit():
+    q = Queue(weights={0: 1, 2: 8})
+    for _ in range(50): await q.put(_Bulk())
+    for _ in range(20): await q.take()
+    await q.put(_Interactive()); await q.put(_Bulk())
+    assert type(await q.take()).priority == 2
+    assert type(await q.take()).priority == 0
+
+async def test_service_priority_binds_commands():
+    from bollydog.models.service import AppService
+    from bollydog.service.registry import RegistryService
+
+    class _Svc(AppService):
+        domain = 'test'
+    svc = _Svc.create_from(priority=0, commands=['example.commands'])
+    reg = RegistryService()
+    reg._register_commands('test._Svc', svc)
+    from example.commands import Ping
+    assert reg.commands['test._Svc.Ping'].priority == 0
+    assert Ping.priority == 1
+
+
+@pytest.mark.slow
+async def test_take_latency_flat_with_in_flight():
+    """take() must not scan IN_FLIGHT entries: 10k in-flight costs the same as none."""
+    async def _take_cost(in_flight, rounds=2000):
+        q = Queue(max_size=in_flight + rounds + 1)
+        for _ in range(in_flight):
+            await q.put(_Job())
+            await q.take()
+        msgs = [_Job() for _ in range(rounds)]
+        start = time.perf_counter()
+        for msg in msgs:
+            await q.put(msg)
+            await q.take()
+            q.complete(msg.iid)
+        return time.perf_counter() - start
+
+    baseline = min([await _take_cost(0) for _ in range(3)])
+    loaded = min([await _take_cost(10_000) for _ in range(3)])
+    assert loaded < baseline * 3
+
+
+# ─── Durable journal ─────────────────────────────────────────
+
+async def _durable_queue(path=':memory:', **kwargs):
+    from bollydog.adapters.memory import SQLiteProtocol
+    q = Queue(**kwargs)
+    q.add_dependency(SQLiteProtocol(path=path))
+    await q.protocol.maybe_start()
+    return q
+
+async def test_journal_group_commit():
+    q = await _durable_queue()
+    a, b, c = await q.put_many([_Durable(n=i) for i in range(3)])
+    await q.put(_Job())  # no destination, not journaled
+    await q.take(); q.complete(a.iid)  # completes inside the window: never written
+    await q.flush()
+    assert sorted(await q.protocol.keys('wal:*')) == sorted(f'wal:{m.iid}' for m in (b, c))
+    await q.take(); q.complete(b.iid)
+    await q.flush()
+    assert await q.protocol.keys('wal:*') == [f'wal:{c.iid}']
+    assert q.stats['journal'] == {'unflushed': 0, 'logged': 1, 'commits': 2}
+    await q.protocol.stop()
+
+async def test_journal_skips_unserializable_record():
+    q = await _durable_queue()
+    bad, good = await q.put(_Durable(data={'conn': object()})), await q.put(_Durable(n=1))
+    await q.flush()
+    assert await q.protocol.keys('wal:*') == [f'wal:{good.iid}']
+    assert bad.iid not in q._logged and q.stats['journal']['logged'] == 1
+    await q.protocol.stop()
+
+async def test_journal_batch_kept_when_store_fails():
+    q = await _durable_queue()
+    msgs = await q.put_many([_Durable(n=i) for i in range(3)])
+    write, calls = q.protocol.set_batch, []
+
+    async def _fail_once(items):
+        calls.append(1)
+        if len(calls) == 1: raise ConnectionError('store down')
+        return await write(items)
+
+    q.protocol.set_batch = _fail_once
+    with pytest.raises(ConnectionError): await q.flush()
+    assert q.stats['journal'] == {'unflushed': 3, 'logged': 0, 'commits': 0}
+    await q.flush()
+    assert sorted(await q.protocol.keys('wal:*')) == sorted(f'wal:{m.iid}' for m in msgs)
+    await q.protocol.stop()
+
+async def test_journal_skips_nested_messages():
+    q = await _durable_queue()
+    await q.put(_Durable(parent_span_id='ab'))
+    await q.flush()
+    assert await q.protocol.keys('wal:*') == []
+    await q.protocol.stop()
+
+async def test_journal_flusher_commits_in_background(tmp_path):
+    q = await _durable_queue(str(tmp_path / 'q.db'), wal_interval=0.01)
+    await q.start()
+    msg = await q.put(_Durable(n=7), not_before=time.time() + 60)
+    await asyncio.sleep(0.1)
+    record = await q.protocol.get(f'wal:{msg.iid}')
+    assert record['destination'] == 'test.Durable._Durable' and record['fields']['n'] == 7
+    assert record['not_before'] > time.time()
+    await q.stop()
+
+async def test_recover_drops_corrupted_records(hub):
+    from bollydog.globals import registry
+    q = await _durable_queue()
+    registry.commands['test.Durable._Durable'] = _Durable
+    try:
+        await q.protocol.set_batch({
+            'wal:good': {'destination': 'test.Durable._Durable', 'not_before': None, 'fields': {'n': 1}},
+            'wal:schema': {'destination': 'test.Durable._Durable', 'not_before': None, 'fields': {'n': 'one'}},
+            'wal:broken': {'fields': {}},
+        })
+        (message, not_before), = await q.recover()
+        assert message.n == 1 and not_before is None
+        assert await q.protocol.keys('wal:*') == ['wal:good']
+    finally:
+        del registry.commands['test.Durable._Durable']
+        await q.protocol.stop()
+
+async def test_no_journal_without_protocol():
+    q = Queue()
+    await q.put(_Durable())
+    assert q.stats['journal'] is None and await q.recover() == []
+
+
+@pytest.mark.slow
+async def test_journal_throughput_benchmark(tmp_path):
+    """put_many + take + complete throughput: in-memory vs durable (SQLite file)."""
+    async def _rate(q, n=20_000, batch=500, drain_later=False):
+        await q.start()
+        start = time.perf_counter()
+        for _ in range(0, n, batch):
+            await q.put_many([_Durable(n=i) for i in range(batch)])
+            if drain_later:
+                await asyncio.sleep(0.001); continue
+            for _ in range(batch):
+                m = await q.take(); m.state.set_result(1); q.complete(m.iid)
+            await asyncio.sleep(0)
+        if drain_later:
+            await asyncio.sleep(0.05)  # every record journaled before its completion
+            for _ in range(n):
+                m = await q.take(); m.state.set_result(1); q.complete(m.iid)
+        if q.protocol is not None: await q.flush()
+        rate = n / (time.perf_counter() - start)
+        await q.stop()
+        return rate
+
+    memory = await _rate(Queue())
+    durable = await _rate(await _durable_queue(str(tmp_path / 'a.db')))
+    journaled = await _rate(await _durable_queue(str(tmp_path / 'b.db'), max_size=20_000, wal_interval=0.005), drain_later=True)
+    assert durable > memory * 0.5
+    assert journaled > memory * 0.2
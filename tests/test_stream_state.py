@@ -1,5 +1,8 @@
 """StreamState tests — async generator Command streaming."""
 import asyncio
+
+import pytest
+
 from bollydog.models.state import StreamState
 
 
@@ -73,3 +76,210 @@ async def test_stream_done_callback_already_done():
     state.add_done_callback(lambda s: called.append('late'))
     await asyncio.sleep(0.05)
     assert 'late' in called
+
+
+# ─── Bounded / non-retaining ──────────────────────────────────
+
+async def test_bounded_put_blocks_until_consumed():
+    state = StreamState(max_size=2)
+    await state.put(1); await state.put(2); await state.put(3)
+    assert await state.get() == 1
+    blocked = asyncio.ensure_future(state.put(4))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert await state.get() == 2
+    await asyncio.wait_for(blocked, 1)
+    await state.put(None)  # end marker never blocks
+    assert [v async for v in state] == [3, 4]
+
+async def test_bounded_set_exception_when_full():
+    state = StreamState(max_size=1)
+    await state.put('a')
+    state.set_exception(ValueError('boom'))
+    assert [v async for v in state] == ['a']
+    assert isinstance(state.exception(), ValueError)
+
+async def test_no_retain_keeps_nothing():
+    state = StreamState(retain=False)
+    for i in range(3): await state.put(i)
+    await state.put(None)
+    assert state._results == []
+    assert [v async for v in state] == [0, 1, 2]
+    assert await state is None
+
+async def test_generator_backpressured_by_slow_consumer(hub):
+    from bollydog.models.base import BaseCommand
+    produced = []
+
+    class _Ticks(BaseCommand):
+        stream_max_size = 4
+        stream_retain = False
+        async def __call__(self):
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+    msg = type('_Ticks', (_Ticks,), {'destination': 'bollydog.HubService._Ticks'})()
+    await hub.dispatch(msg)
+    assert await msg.state.get() == 0  # a consumer attaches, the bound applies from here
+    await asyncio.sleep(0.05)
+    assert len(produced) <= 8
+    assert [v async for v in msg.state] == list(range(1, 100))
+
+async def test_close_stops_blocked_generator(hub):
+    from bollydog.models.base import BaseCommand
+    closed = []
+
+    class _Endless(BaseCommand):
+        stream_max_size = 2
+        async def __call__(self):
+            try:
+                i = 0
+                while True:
+                    yield i; i += 1
+            finally: closed.append(1)
+
+    msg = type('_Endless', (_Endless,), {'destination': 'bollydog.HubService._Endless'})()
+    await hub.dispatch(msg)
+    assert (await msg.state.get_batch())[0] == 0
+    await asyncio.sleep(0.01)  # generator now blocked on the bound
+    msg.state.close()
+    await asyncio.sleep(0.05)
+    assert msg.state.done() and msg.state.exception() is None
+    assert closed == [1] and msg.iid not in hub.queue._store
+
+async def test_bounded_stream_awaited_without_consumer(hub):
+    from bollydog.models.base import BaseCommand
+
+    class _Few(BaseCommand):
+        stream_max_size = 2
+        async def __call__(self):
+            for i in range(5): yield i
+
+    msg = type('_Few', (_Few,), {'destination': 'bollydog.HubService._Few'})()
+    assert await asyncio.wait_for(hub.execute(msg), 1) == [0, 1, 2, 3, 4]
+
+async def test_bounded_stream_awaited_in_execute_mode(hub):
+    from bollydog.models.base import BaseCommand
+    from bollydog.service.executor import ExecuteService
+
+    class _Few(BaseCommand):
+        stream_max_size = 2
+        async def __call__(self):
+            for i in range(5): yield i
+
+    assert await asyncio.wait_for(ExecuteService().execute(_Few()), 1) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.slow
+async def test_million_item_stream_memory_is_bounded():
+    import tracemalloc
+    state = StreamState(max_size=64, retain=False)
+
+    async def _produce():
+        for i in range(1_000_000): await state.put(i)
+        await state.put(None)
+
+    tracemalloc.start()
+    producer = asyncio.ensure_future(_produce())
+    count = 0
+    async for _ in state: count += 1
+    await producer
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert count == 1_000_000
+    assert peak < 1_000_000  # a retained / unbounded stream holds ~40MB of ints
+
+
+# ─── Batch drain ──────────────────────────────────────────────
+
+async def test_get_batch_drains_available():
+    state = StreamState()
+    for i in range(5): await state.put(i)
+    assert await state.get_batch(max_items=3) == [0, 1, 2]
+    await state.put(None)
+    assert await state.get_batch() == [3, 4]
+    assert await state.get_batch() == []
+    assert await state.get_batch() == []
+
+async def test_get_batch_waits_for_more():
+    state = StreamState()
+    async def _produce():
+        for i in range(3):
+            await state.put(i); await asyncio.sleep(0.01)
+        await state.put(None)
+    asyncio.ensure_future(_produce())
+    assert await state.get_batch(max_wait=0.2) == [0, 1, 2]
+    assert await state.get_batch(max_wait=0.2) == []
+
+async def test_batches_iterates_until_end():
+    state = StreamState()
+    for i in range(10): await state.put(i)
+    await state.put(None)
+    assert [b async for b in state.batches(max_items=4)] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+# ─── Broadcast ────────────────────────────────────────────────
+
+async def test_broadcast_serves_every_subscriber():
+    state = StreamState(broadcast=8)
+    a, b = state.subscribe(), state.subscribe()
+    for i in range(3): await state.put(i)
+    await state.put(None)
+    assert [v async for v in a] == [0, 1, 2]
+    assert [v async for v in b] == [0, 1, 2]
+    assert [v async for v in state] == [0, 1, 2]
+
+async def test_broadcast_late_join_replays_window():
+    state = StreamState(broadcast=3)
+    for i in range(5): await state.put(i)
+    late, live = state.subscribe(), state.subscribe(replay=False)
+    assert await late.get_batch() == [2, 3, 4]
+    await state.put(5); await state.put(None)
+    assert [v async for v in late] == [5]
+    assert [v async for v in live] == [5]
+
+async def test_broadcast_evicts_slow_subscriber():
+    from bollydog.exception import StreamSubscriberEvictedError
+    state = StreamState(broadcast=4)
+    slow, fast = state.subscribe(), state.subscribe()
+
+    async def _consume(cursor):
+        return [v async for v in cursor]
+
+    reader = asyncio.ensure_future(_consume(fast))
+    for i in range(10):
+        await state.put(i); await asyncio.sleep(0)
+    await state.put(None)
+    assert await reader == list(range(10))
+    with pytest.raises(StreamSubscriberEvictedError):
+        await slow.get_batch()
+    assert state.evicted == 1
+
+async def test_broadcast_waiters_wake_on_put():
+    state = StreamState(broadcast=4)
+    cursors = [state.subscribe() for _ in range(3)]
+    waiting = [asyncio.ensure_future(c.get_batch()) for c in cursors]
+    await asyncio.sleep(0)
+    await state.put('x')
+    assert await asyncio.gather(*waiting) == [['x']] * 3
+
+async def test_websocket_join_running_broadcast():
+    from unittest.mock import AsyncMock
+    from bollydog.entrypoint.websocket.app import SocketService
+    from bollydog.models.base import BaseCommand
+
+    class _Feed(BaseCommand):
+        stream_broadcast = 16
+        async def __call__(self): yield 1
+
+    svc, msg = SocketService(), _Feed()
+    svc.streams[msg.trace_id] = msg
+    await msg.state.put('a'); await msg.state.put('b'); await msg.state.put(None)
+    ws = AsyncMock()
+    await svc._join(ws, msg.trace_id)
+    assert [c.args[0] for c in ws.send_json.await_args_list] == [{'trace_id': msg.trace_id, 'data': v} for v in 'ab']
+    assert ws in svc.listening[msg.trace_id]
+    missing = AsyncMock()
+    await svc._join(missing, 'nope')
+    assert 'error' in missing.send_json.await_args.args[0]
@@ -1,5 +1,10 @@
 """Layer 1: Pure logic tests — no asyncio, no Service lifecycle."""
-from bollydog.service.exchange import match_topic
+import random
+import time
+
+import pytest
+
+from bollydog.service.exchange import TopicTrie, match_topic
 from bollydog.models.base import BaseCommand, BaseEvent
 
 
@@ -36,6 +41,60 @@ def test_mixed_wildcard_and_hash():
     assert match_topic("a.*.#", "a.b.c.d")
     assert not match_topic("a.*.#", "a")
 
+def test_adjacent_hashes():
+    assert match_topic("#.#.#", "a")
+    assert match_topic("a.#.#.b", "a.b")
+    assert match_topic("#.b.#", "x.y.b")
+    assert not match_topic("#.b.#", "x.y.c")
+
+def test_adversarial_hashes_are_not_exponential():
+    pattern, topic = ".".join(["#"] * 30 + ["z"]), ".".join(["a"] * 60)
+    start = time.perf_counter()
+    assert not match_topic(pattern, topic)
+    assert not TopicTrie({pattern: {"d"}}).match(topic)
+    assert time.perf_counter() - start < 0.5
+
+
+# ─── TopicTrie ────────────────────────────────────────────────
+
+def test_trie_matches_all_patterns_in_one_walk():
+    trie = TopicTrie({"a.b.c": {"exact"}, "a.*.c": {"star"}, "a.#": {"hash"}, "#": {"all"}, "b.#": {"other"}})
+    assert trie.match("a.b.c") == {"exact", "star", "hash", "all"}
+    assert trie.match("a") == {"hash", "all"}
+    assert trie.match("b") == {"other", "all"}
+
+def test_trie_agrees_with_match_topic():
+    rng = random.Random(7)
+    segments = ["a", "b", "c", "*", "#"]
+    patterns = {".".join(rng.choice(segments) for _ in range(rng.randint(1, 5))) for _ in range(300)}
+    trie = TopicTrie({p: {p} for p in patterns})
+    for _ in range(300):
+        topic = ".".join(rng.choice("abc") for _ in range(rng.randint(1, 6)))
+        assert trie.match(topic) == {p for p in patterns if match_topic(p, topic)}
+
+
+@pytest.mark.slow
+def test_trie_10k_patterns_benchmark():
+    """One trie walk over 10k patterns beats scanning them with match_topic."""
+    rng = random.Random(1)
+    words = [f"w{i}" for i in range(50)]
+    patterns = set()
+    while len(patterns) < 10_000:
+        seg = [rng.choice(words + ["*"]) for _ in range(rng.randint(2, 4))]
+        if rng.random() < 0.1: seg.append("#")
+        patterns.add(".".join(seg))
+    topics = [".".join(rng.choice(words) for _ in range(3)) for _ in range(50)]
+    trie = TopicTrie({p: {p} for p in patterns})
+
+    start = time.perf_counter()
+    walked = [trie.match(t) for t in topics]
+    trie_cost = time.perf_counter() - start
+    start = time.perf_counter()
+    scanned = [{p for p in patterns if match_topic(p, t)} for t in topics]
+    scan_cost = time.perf_counter() - start
+    assert walked == scanned
+    assert trie_cost * 20 < scan_cost
+
 
 # ─── BaseCommand.__init_subclass__ ───────────────────────────
 
@@ -71,3 +130,21 @@ def test_command_str():
     s = str(inst)
     assert 'Command(Baz)' in s
     assert 'trace=' in s
+
+def test_command_shape_computed_per_class(monkeypatch):
+    from bollydog.models.base import COROUTINE, ASYNC_GEN, EVENT
+
+    class Plain(BaseCommand):
+        async def __call__(self): return 1
+
+    class Gen(BaseCommand):
+        async def __call__(self): yield 1
+
+    class Happened(BaseEvent):
+        destination = 'app.Svc.Happened'
+
+    Bound = type('Gen', (Gen,), {'destination': 'app.Svc.Gen'})
+    assert (Plain._shape, Gen._shape, Bound._shape, Happened._shape) == (COROUTINE, ASYNC_GEN, ASYNC_GEN, EVENT)
+    import inspect
+    monkeypatch.setattr(inspect, 'isasyncgenfunction', lambda f: pytest.fail('introspected on hot path'))
+    assert Bound().is_async_gen and not Plain().is_async_gen
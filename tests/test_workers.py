@@ -0,0 +1,124 @@
+"""Multi-process Hub tests — WorkerPoolHub routing against in-process fake workers."""
+import asyncio
+import json
+
+import pytest
+
+from bollydog.entrypoint.uds.app import _read_frame, _write_frame
+from bollydog.exception import RemoteExecutionError, ServiceMaxSizeOfQueueError
+from bollydog.models.base import BaseCommand, BaseEvent
+from bollydog.service.workers import WorkerPoolHub, worker_config
+
+
+class _Add(BaseCommand):
+    a: int = 0
+    b: int = 0
+    async def __call__(self) -> int:
+        return self.a + self.b
+
+_BoundAdd = type('_Add', (_Add,), {'destination': 'test.Svc._Add'})
+
+
+async def _fake_worker(path, seen, fail=False, error_type=None):
+    async def _handle(reader, writer):
+        req = json.loads(await _read_frame(reader))
+        seen.append(req)
+        if fail:
+            resp = {'status': 'error', 'error': 'boom', 'type': error_type}
+        else:
+            kw = req['kwargs']
+            resp = {'status': 'ok', 'result': {**kw, 'state': ['FINISHED', kw['a'] + kw['b']]}}
+        _write_frame(writer, json.dumps(resp))
+        await writer.drain()
+        writer.close()
+    return await asyncio.start_unix_server(_handle, path=path)
+
+
+def test_worker_config_drops_entrypoints():
+    conf = {'bollydog.service.app.HubService': {}, 'bollydog.entrypoint.http.app.HttpService': {},
+            'custom': {'module': 'bollydog.entrypoint.websocket.app.SocketService'}}
+    out = worker_config(conf, '/tmp/w.sock')
+    assert set(out) == {'bollydog.service.app.HubService', 'bollydog.entrypoint.uds.app.UdsService'}
+    assert out['bollydog.entrypoint.uds.app.UdsService'] == {'sock_path': '/tmp/w.sock'}
+    assert out['bollydog.service.app.HubService'] == {'schedule': False}
+
+def test_bootstrap_workers_swaps_hub():
+    from bollydog.bootstrap import Bootstrap
+    b = Bootstrap(workers=3, override_logging=False)
+    hub = b.services['bollydog.HubService']
+    assert isinstance(hub, WorkerPoolHub)
+    assert hub.workers == 3
+
+async def test_forward_to_least_loaded(tmp_path):
+    seen0, seen1 = [], []
+    hub = WorkerPoolHub(workers=2, sock_path=str(tmp_path / 'w.sock'))
+    s0 = await _fake_worker(hub.worker_sock(0), seen0)
+    s1 = await _fake_worker(hub.worker_sock(1), seen1)
+    hub._load[0] = 5
+    msg = _BoundAdd(a=2, b=3)
+    await hub._run_with_context(msg)
+    assert await msg.state == 5
+    assert seen0 == [] and seen1[0]['command'] == 'test.Svc._Add'
+    assert seen1[0]['kwargs']['iid'] == msg.iid
+    assert hub.load == {hub.worker_sock(0): 5, hub.worker_sock(1): 0}
+    s0.close(); s1.close()
+
+async def test_forward_remote_error(tmp_path):
+    hub = WorkerPoolHub(workers=1, sock_path=str(tmp_path / 'w.sock'))
+    server = await _fake_worker(hub.worker_sock(0), [], fail=True)
+    msg = _BoundAdd()
+    await hub._run_with_context(msg)
+    with pytest.raises(RemoteExecutionError, match='boom'):
+        await msg.state
+    server.close()
+
+async def test_unreachable_worker_runs_locally(hub, tmp_path):
+    pool = WorkerPoolHub(workers=1, sock_path=str(tmp_path / 'missing.sock'))
+    msg = _BoundAdd(a=1, b=1)
+    await pool._run_with_context(msg)
+    assert await msg.state == 2
+    assert pool.load == {pool.worker_sock(0): 0}
+
+async def test_forward_keeps_error_class(tmp_path):
+    hub = WorkerPoolHub(workers=1, sock_path=str(tmp_path / 'w.sock'))
+    server = await _fake_worker(hub.worker_sock(0), [], fail=True, error_type='ServiceMaxSizeOfQueueError')
+    msg = _BoundAdd()
+    await hub._run_with_context(msg)
+    with pytest.raises(ServiceMaxSizeOfQueueError, match='boom'):
+        await msg.state
+    server.close()
+
+async def test_events_and_subscribers_stay_in_front(hub, tmp_path):
+    from bollydog.globals import registry
+
+    class ThingDone(BaseEvent):
+        destination = 'test.topic.ThingDone'
+        n: int = 0
+
+    got = []
+
+    class _Svc:
+        async def on_done(self, event): got.append(event.n)
+
+    async def _call(self, _bm=_Svc().on_done): return await _bm(self._source)
+    handler = type('on_done', (BaseCommand,), {'destination': 'test.Svc.on_done', 'alias': 'on_done', '_source': None, '__call__': _call})
+    registry.commands['test.Svc.on_done'] = handler
+    registry.subscribe('test.topic.ThingDone', 'test.Svc.on_done')
+    seen = []
+    pool = WorkerPoolHub(workers=1, sock_path=str(tmp_path / 'w.sock'))
+    server = await _fake_worker(pool.worker_sock(0), seen)
+    try:
+        event = ThingDone(n=3)
+        hub.exchange.bind_subscriber_callbacks(event)
+        await pool._run_with_context(event)
+        assert await event.state is True
+        await asyncio.sleep(0.05)  # front Exchange dispatched the handler once
+        assert got == [3]
+        command = handler.fast_construct()
+        command._source = event
+        await pool._run_with_context(command)
+        assert got == [3, 3] and seen == []
+    finally:
+        registry.unsubscribe('test.topic.ThingDone', 'test.Svc.on_done')
+        del registry.commands['test.Svc.on_done']
+        server.close()